@@ -4,89 +4,188 @@ Se espera que se le suministre:
   - transitions: diccionario con la forma { state_id: { símbolo: state_id_destino, ... }, ... }
   - accepting_states: conjunto de estados (números) que son de aceptación.
   - Se asume que el estado inicial es el 0.
+  - tags (opcional): diccionario estado de aceptación -> etiqueta (hashable). Dos estados de
+    aceptación con etiquetas distintas nunca se fusionan; se usa, por ejemplo, para conservar
+    qué patrones acepta cada estado de un AFD multipatrón.
+  - stats (opcional): objeto pipelineStats.CompileStats donde se registran las iteraciones,
+    las divisiones y el número de estados antes y después de minimizar.
 El módulo retorna:
   - new_initial: número del estado inicial del DFA minimizado.
   - new_transitions: diccionario con las transiciones del DFA minimizado.
   - new_accepting: conjunto de estados finales (nuevos).
   - state_to_block: mapeo original de cada estado a su bloque (número de bloque).
   - P: la lista de bloques (cada bloque es un conjunto de estados equivalentes).
+
+Implementación (O(m log n), con m = número de transiciones):
+  - Se precalculan las transiciones inversas de cada estado, agrupadas por símbolo,
+    de modo que un divisor sólo recorre las aristas que llegan a él.
+  - La partición es refinable: los estados se guardan en un arreglo donde cada bloque
+    ocupa un tramo contiguo [first, end), y dividir un bloque cuesta lo mismo que
+    el número de estados marcados.
+  - La lista de trabajo W guarda identificadores de bloque y un arreglo in_w indica
+    en O(1) si un bloque ya está pendiente.
+  - Los AFD parciales (sin todas las transiciones) se tratan con un estado muerto
+    implícito que pertenece al bloque de no aceptación y que nunca se usa como divisor.
 """
 
-def minimize_dfa(transitions, accepting_states):
-    # Q es el conjunto de todos los estados (asumidos como las llaves de transitions)
-    Q = set(transitions.keys())
-    # En caso de que existan estados destino que no sean llave en transitions, agrégalos:
-    for s, trans in transitions.items():
+from collections import deque
+
+def minimize_dfa(transitions, accepting_states, tags=None, stats=None):
+    # Q es el conjunto de todos los estados (las llaves de transitions y los destinos).
+    # Cada estado se numera con un índice denso para trabajar con listas en lugar de diccionarios.
+    states = list(transitions.keys())
+    index = {s: i for i, s in enumerate(states)}
+    for trans in transitions.values():
         for dest in trans.values():
-            Q.add(dest)
-            
-    # F = estados de aceptación y noF = Q \ F
-    F = set(accepting_states)
-    nonF = Q - F
-
-    # Inicializar la partición: solo se incluyen bloques no vacíos.
-    P = []
-    if F:
-        P.append(F)
-    if nonF:
-        P.append(nonF)
-        
-    # Inicializar W (lista de bloques a procesar)
-    W = list(P)
-    
-    # Calcular el alfabeto: unión de símbolos de todas las transiciones
-    alphabet = set()
-    for s in Q:
-        if s in transitions:
-            for sym in transitions[s]:
-                alphabet.add(sym)
-    
-    # Algoritmo de Hopcroft:
+            if dest not in index:
+                index[dest] = len(states)
+                states.append(dest)
+    for s in accepting_states:
+        if s not in index:
+            index[s] = len(states)
+            states.append(s)
+    n = len(states)
+
+    # Transiciones inversas: inverse[t] = { símbolo: [estados s tales que δ(s, símbolo) = t] }
+    inverse = [None] * n
+    for s, trans in transitions.items():
+        i = index[s]
+        for sym, dest in trans.items():
+            j = index[dest]
+            preds = inverse[j]
+            if preds is None:
+                preds = inverse[j] = {}
+            bucket = preds.get(sym)
+            if bucket is None:
+                preds[sym] = [i]
+            else:
+                bucket.append(i)
+
+    # Partición refinable. La partición inicial tiene un bloque por cada etiqueta de aceptación
+    # (sin tags, un único bloque F) y, al final, el bloque Q \ F junto con el estado muerto
+    # implícito. Al dividir un bloque, la parte marcada recibe un identificador nuevo y el resto
+    # conserva el anterior, por lo que el estado muerto vive siempre en el bloque dead_block.
+    final_key = [None] * n
+    for s in accepting_states:
+        final_key[index[s]] = True if tags is None else tags[s]
+    groups = {}
+    for i in range(n):
+        if final_key[i] is not None:
+            groups.setdefault(final_key[i], []).append(i)
+    elems = []
+    first = []
+    end = []
+    for members in groups.values():
+        first.append(len(elems))
+        elems.extend(members)
+        end.append(len(elems))
+    dead_block = len(first)
+    first.append(len(elems))
+    elems.extend(i for i in range(n) if final_key[i] is None)
+    end.append(n)
+    loc = [0] * n
+    block_of = [0] * n
+    for b in range(len(first)):
+        for pos in range(first[b], end[b]):
+            loc[elems[pos]] = pos
+            block_of[elems[pos]] = b
+    marked = [0] * len(first)
+
+    # W contiene todos los bloques iniciales excepto Q \ F: basta omitir uno de ellos, y así
+    # el bloque del estado muerto nunca se procesa como divisor.
+    W = list(range(dead_block))
+    in_w = [True] * dead_block + [False]
+
+    touched = []
+    iterations = 0
     while W:
         A = W.pop()
-        for c in alphabet:
-            # X es el conjunto de estados que tienen, con el símbolo c, una transición a algún estado en A.
-            X = set()
-            for s in Q:
-                if s in transitions and c in transitions[s]:
-                    if transitions[s][c] in A:
-                        X.add(s)
-            # Dividir cada bloque Y de P en dos (Y∩X y Y\X) si corresponde
-            new_P = []
-            for Y in P:
-                intersection = Y.intersection(X)
-                difference = Y - X
-                if intersection and difference:
-                    new_P.append(intersection)
-                    new_P.append(difference)
-                    # Actualizar W: si Y estaba en W, se reemplaza por ambos bloques; si no, se añade el de menor tamaño.
-                    if Y in W:
-                        W.remove(Y)
-                        W.append(intersection)
-                        W.append(difference)
-                    else:
-                        if len(intersection) <= len(difference):
-                            W.append(intersection)
-                        else:
-                            W.append(difference)
+        in_w[A] = False
+        iterations += 1
+        # Se agrupan por símbolo los predecesores del bloque A (copiado antes de dividir).
+        splitters = {}
+        for t in elems[first[A]:end[A]]:
+            preds = inverse[t]
+            if preds is None:
+                continue
+            for sym, sources in preds.items():
+                bucket = splitters.get(sym)
+                if bucket is None:
+                    splitters[sym] = list(sources)
                 else:
-                    new_P.append(Y)
-            P = new_P
+                    bucket.extend(sources)
 
-    # Ahora cada bloque en P es un conjunto de estados equivalentes.
-    # Creamos un mapeo de cada estado a su bloque (identificado con un número).
-    state_to_block = {}
-    for i, block in enumerate(P):
-        for s in block:
-            state_to_block[s] = i
+        for X in splitters.values():
+            # Marcar: mover cada estado de X al inicio de su bloque.
+            for s in X:
+                b = block_of[s]
+                if marked[b] == 0:
+                    touched.append(b)
+                pos = loc[s]
+                target = first[b] + marked[b]
+                other = elems[target]
+                elems[pos] = other
+                loc[other] = pos
+                elems[target] = s
+                loc[s] = target
+                marked[b] += 1
 
-    # Construir las transiciones del DFA minimizado
+            # Dividir cada bloque Y tocado en Y∩X (bloque nuevo) y Y\X (conserva su id).
+            for Y in touched:
+                m = marked[Y]
+                marked[Y] = 0
+                # El bloque del estado muerto siempre conserva un elemento implícito sin marcar.
+                if m == end[Y] - first[Y] and Y != dead_block:
+                    continue
+                new_block = len(first)
+                first.append(first[Y])
+                end.append(first[Y] + m)
+                marked.append(0)
+                in_w.append(False)
+                first[Y] += m
+                for pos in range(first[new_block], end[new_block]):
+                    block_of[elems[pos]] = new_block
+                # Si Y estaba pendiente, ambas mitades deben quedar pendientes; si no, basta la menor
+                # (excepto si Y es el bloque del estado muerto, que nunca se agrega a W).
+                if in_w[Y] or Y == dead_block or m <= end[Y] - first[Y]:
+                    W.append(new_block)
+                    in_w[new_block] = True
+                else:
+                    W.append(Y)
+                    in_w[Y] = True
+            touched.clear()
+
+    # Numerar los bloques no vacíos en orden de recorrido (BFS) desde el bloque del estado 0,
+    # y después los bloques no alcanzables en su orden interno.
+    block_number = {}
+    if 0 in index:
+        queue = deque([block_of[index[0]]])
+        block_number[queue[0]] = 0
+        while queue:
+            b = queue.popleft()
+            rep = states[elems[first[b]]]
+            for dest in transitions.get(rep, {}).values():
+                db = block_of[index[dest]]
+                if db not in block_number:
+                    block_number[db] = len(block_number)
+                    queue.append(db)
+    for b in range(len(first)):
+        if first[b] < end[b] and b not in block_number:
+            block_number[b] = len(block_number)
+
+    P = [None] * len(block_number)
+    reps = [None] * len(block_number)
+    for b, number in block_number.items():
+        P[number] = {states[i] for i in elems[first[b]:end[b]]}
+        reps[number] = states[elems[first[b]]]
+
+    # Crear un mapeo de cada estado a su bloque (identificado con un número).
+    state_to_block = {states[i]: block_number[block_of[i]] for i in range(n)}
+
+    # Construir las transiciones del DFA minimizado a partir de un representante por bloque.
     new_transitions = {}
-    for block in P:
-        rep = next(iter(block))  # elegimos un representante
-        block_id = state_to_block[rep]
+    for block_id, rep in enumerate(reps):
         new_transitions[block_id] = {}
-        # Para cada símbolo, la transición se define a partir del representante.
         if rep in transitions:
             for sym, dest in transitions[rep].items():
                 new_transitions[block_id][sym] = state_to_block[dest]
@@ -94,10 +193,10 @@ def minimize_dfa(transitions, accepting_states):
     # Estado inicial minimizado: el bloque que contiene al estado 0.
     new_initial = state_to_block[0]
     # Estados de aceptación minimizados: bloques que contienen al menos un estado de aceptación.
-    new_accepting = set()
-    for block in P:
-        if block.intersection(accepting_states):
-            new_accepting.add(state_to_block[next(iter(block))])
-            
-    return new_initial, new_transitions, new_accepting, state_to_block, P
+    new_accepting = {state_to_block[s] for s in accepting_states}
 
+    if stats is not None:
+        # Cada división agrega un bloque a la partición inicial.
+        stats.record_minimize(n, len(P), iterations, len(first) - dead_block - 1)
+
+    return new_initial, new_transitions, new_accepting, state_to_block, P
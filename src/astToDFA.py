@@ -8,10 +8,24 @@ Se calculan para cada nodo las funciones:
   - lastpos
 y se construye la tabla followpos para cada posición (hoja).
 Luego, a partir de firstpos de la raíz se genera el AFD no minimizado.
+
+Además del cálculo con conjuntos (compute_functions, compute_followpos, build_dfa), el módulo
+incluye un motor de posiciones con bitsets: firstpos, lastpos, followpos y los estados del DFA
+se representan como enteros donde el bit p indica la posición p, desplazados a la posición más
+baja del conjunto (ventanas, ver to_window). Así el sucesor de un estado es un OR de máscaras
+precalculadas y los estados se identifican por una ventana en lugar de un frozenset. direct_dfa_from_ast usa este motor y convierte el resultado al formato con conjuntos.
+
+La hoja LITERAL '#' (syToSyntaxTree.EPSILON) es la cadena vacía: es anulable, no recibe
+posición y tiene firstpos y lastpos vacíos. El carácter '#' se representa con la hoja de
+clase "#" (de "[#]" o "\#").
 """
 
 from collections import defaultdict
 
+from symbolClasses import partition_alphabet, label_ranges, ranges_label
+from syToSyntaxTree import EPSILON, iter_postorder
+from compactAST import LITERAL, OPERATOR, NO_CHILD
+
 def compute_functions(node, pos_counter, pos_dict):
     """
     Recorre el AST en postorden asignando números de posición a las hojas
@@ -20,48 +34,55 @@ def compute_functions(node, pos_counter, pos_dict):
     - pos_counter: lista con un entero (contador mutable) que inicia en 1.
     - pos_dict: diccionario que mapea posición -> símbolo.
     
-    Se asume que si un nodo es hoja, se le asigna una posición (excepto, por convención,
-    si se utilizase una representación de ε; en nuestro caso, usamos '#' como marcador).
-    """
-    # Caso hoja (sin hijos)
-    if node.izquierdo is None and node.derecho is None:
-        # Asumimos que toda hoja representa un símbolo que debe aparecer (incluso '#' se numerará)
-        node.nullable = False
-        node.pos = pos_counter[0]
-        pos_dict[node.pos] = node.valor
-        pos_counter[0] += 1
-        node.firstpos = {node.pos}
-        node.lastpos = {node.pos}
-        return
-
-    # Procesar subárboles (postorden)
-    if node.izquierdo:
-        compute_functions(node.izquierdo, pos_counter, pos_dict)
-    if node.derecho:
-        compute_functions(node.derecho, pos_counter, pos_dict)
+    Toda hoja recibe una posición, excepto la hoja ε (EPSILON, '#'), que es anulable y tiene
+    firstpos y lastpos vacíos.
+    El recorrido usa una pila explícita (iter_postorder), por lo que no hay límite de profundidad.
+    """
+    for node in iter_postorder(node):
+        # Caso hoja (sin hijos)
+        if node.izquierdo is None and node.derecho is None:
+            if node.token_type == "LITERAL" and node.valor == EPSILON:
+                # La cadena vacía no ocupa posición.
+                node.nullable = True
+                node.pos = None
+                node.firstpos = set()
+                node.lastpos = set()
+                continue
+            node.nullable = False
+            node.pos = pos_counter[0]
+            pos_dict[node.pos] = node.valor
+            pos_counter[0] += 1
+            node.firstpos = {node.pos}
+            node.lastpos = {node.pos}
+            continue
 
-    # Calcular según el operador del nodo
-    if node.token_type == "OPERATOR":
-        if node.valor == '|':
-            node.nullable = node.izquierdo.nullable or node.derecho.nullable
-            node.firstpos = node.izquierdo.firstpos.union(node.derecho.firstpos)
-            node.lastpos = node.izquierdo.lastpos.union(node.derecho.lastpos)
-        elif node.valor == '.':
-            node.nullable = node.izquierdo.nullable and node.derecho.nullable
-            if node.izquierdo.nullable:
+        # Calcular según el operador del nodo (los hijos ya fueron procesados)
+        if node.token_type == "OPERATOR":
+            if node.valor == '|':
+                node.nullable = node.izquierdo.nullable or node.derecho.nullable
                 node.firstpos = node.izquierdo.firstpos.union(node.derecho.firstpos)
-            else:
-                node.firstpos = node.izquierdo.firstpos
-            if node.derecho.nullable:
                 node.lastpos = node.izquierdo.lastpos.union(node.derecho.lastpos)
+            elif node.valor == '.':
+                node.nullable = node.izquierdo.nullable and node.derecho.nullable
+                if node.izquierdo.nullable:
+                    node.firstpos = node.izquierdo.firstpos.union(node.derecho.firstpos)
+                else:
+                    node.firstpos = node.izquierdo.firstpos
+                if node.derecho.nullable:
+                    node.lastpos = node.izquierdo.lastpos.union(node.derecho.lastpos)
+                else:
+                    node.lastpos = node.derecho.lastpos
+            elif node.valor == '*':
+                node.nullable = True
+                node.firstpos = node.izquierdo.firstpos
+                node.lastpos = node.izquierdo.lastpos
+            elif node.valor == '+':
+                # X+ tiene los mismos firstpos, lastpos y nullable que X.
+                node.nullable = node.izquierdo.nullable
+                node.firstpos = node.izquierdo.firstpos
+                node.lastpos = node.izquierdo.lastpos
             else:
-                node.lastpos = node.derecho.lastpos
-        elif node.valor == '*':
-            node.nullable = True
-            node.firstpos = node.izquierdo.firstpos
-            node.lastpos = node.izquierdo.lastpos
-        else:
-            raise ValueError(f"Operador desconocido en compute_functions: {node.valor}")
+                raise ValueError(f"Operador desconocido en compute_functions: {node.valor}")
 
 def compute_followpos(node, followpos):
     """
@@ -69,34 +90,55 @@ def compute_followpos(node, followpos):
     de acuerdo con las siguientes reglas:
       - Para un nodo de concatenación ('.'):
             Para cada posición p en lastpos(izquierdo), se añade firstpos(derecho) a followpos[p].
-      - Para un nodo de Kleene star ('*'):
+      - Para un nodo de Kleene star ('*') o de cerradura positiva ('+'):
             Para cada posición p en lastpos(nodo), se añade firstpos(nodo) a followpos[p].
+    Una vez usados por su padre, los conjuntos firstpos y lastpos de cada nodo se liberan
+    (quedan en None): al terminar sólo se conservan los de la raíz, que build_dfa necesita.
     """
-
-    # Procesamos nodos de operador.
-    if node.token_type == "OPERATOR":
-        if node.valor == '.':
+    # Recorrido en postorden: el padre se procesa después de sus hijos.
+    for node in iter_postorder(node):
+        if node.token_type == "OPERATOR":
+            if node.valor == '.':
                 for p in node.izquierdo.lastpos:
                     followpos[p] = followpos[p].union(node.derecho.firstpos)
-        elif node.valor == '*':
-            for p in node.lastpos:
-                followpos[p] = followpos[p].union(node.firstpos)
+            elif node.valor in ('*', '+'):
+                for p in node.lastpos:
+                    followpos[p] = followpos[p].union(node.firstpos)
+            for child in (node.izquierdo, node.derecho):
+                if child is not None:
+                    child.firstpos = child.lastpos = None
 
-    # Recorrer recursivamente en postorden
-    if node.izquierdo:
-        compute_followpos(node.izquierdo, followpos)
-    if node.derecho:
-        compute_followpos(node.derecho, followpos)
+def position_classes(pos_dict):
+    """
+    Particiona el alfabeto (excluyendo '$') en clases disjuntas y asocia a cada posición los
+    identificadores de las clases que contiene.
+
+    Retorna:
+      - class_labels: lista id de clase -> etiqueta canónica de la clase.
+      - classes_of_pos: diccionario posición -> lista de ids de clase (sin el marcador '$').
+    """
+    labels = sorted({symbol for symbol in pos_dict.values() if symbol != '$'})
+    classes, members = partition_alphabet([label_ranges(label) for label in labels])
+    class_labels = [ranges_label(c) for c in classes]
+    classes_of_label = dict(zip(labels, members))
+    classes_of_pos = {p: classes_of_label[symbol] for p, symbol in pos_dict.items() if symbol != '$'}
+    return class_labels, classes_of_pos
 
-def build_dfa(root, pos_dict, followpos):
+def build_dfa(root, pos_dict, followpos, unanchored=False):
     """
     Construye el AFD no minimizado a partir del AST.
     
     - El estado inicial es el conjunto firstpos de la raíz.
     - Se consideran como estados del DFA conjuntos (frozenset) de posiciones.
-    - Para cada estado y cada símbolo del alfabeto (obtenido de pos_dict, excepto '#'),
-      se define una transición.
-    - Un estado es final si contiene la posición correspondiente al marcador '#'.
+    - Los símbolos de pos_dict (literales o clases de rangos como "[A-Z]") se dividen una sola
+      vez en clases de caracteres disjuntas (ver symbolClasses.partition_alphabet). Para cada
+      estado y cada clase presente en sus posiciones se define una transición etiquetada con la
+      etiqueta canónica de la clase; un literal que no se solapa con otros conserva su carácter.
+    - Un estado es final si contiene la posición correspondiente al marcador '$'.
+    - Si unanchored es True, se construye el AFD de Σ*·R: cada estado destino incluye además
+      firstpos de la raíz (una coincidencia puede empezar en cualquier posición) y todos los
+      estados tienen transición con todo el alfabeto. Los caracteres fuera del alfabeto
+      deben llevar al estado inicial (ver CompiledDFA con default).
     
     Retorna:
       - dfa_states: mapeo de estados (frozenset) a números (identificador de estado).
@@ -117,22 +159,28 @@ def build_dfa(root, pos_dict, followpos):
             marker_pos = pos
             break
 
+    class_labels, classes_of_pos = position_classes(pos_dict)
+
     while unmarked:
         state = unmarked.pop()
         transitions[state] = {}
-        # Para cada símbolo (excluyendo '$')
-        alphabet = set()
+        # Agrupar los followpos de las posiciones del estado por clase de caracteres.
+        moves = {}
         for p in state:
-            if pos_dict[p] != '$':
-                alphabet.add(pos_dict[p])
-        for symbol in alphabet:
-            new_state = set()
-            for p in state:
-                if pos_dict[p] == symbol:
-                    new_state = new_state.union(followpos[p])
+            for cls in classes_of_pos.get(p, ()):
+                if cls in moves:
+                    moves[cls].update(followpos[p])
+                else:
+                    moves[cls] = set(followpos[p])
+        # En modo no anclado se usa el alfabeto completo y se reinicia desde firstpos en cada paso.
+        alphabet = range(len(class_labels)) if unanchored else sorted(moves)
+        for cls in alphabet:
+            new_state = moves.get(cls, set())
+            if unanchored:
+                new_state.update(initial_state)
             new_state = frozenset(new_state)
             if new_state:
-                transitions[state][symbol] = new_state
+                transitions[state][class_labels[cls]] = new_state
                 if new_state not in dfa_states:
                     dfa_states[new_state] = len(dfa_states)
                     unmarked.append(new_state)
@@ -141,11 +189,270 @@ def build_dfa(root, pos_dict, followpos):
             accepting_states.add(dfa_states[state])
     return dfa_states, transitions, accepting_states
 
-def direct_dfa_from_ast(root):
+# Ancho (en bits) a partir del cual iter_bits recorre la representación binaria de la máscara.
+WIDE_MASK_BITS = 1024
+
+def iter_bits(mask):
+    """Produce, en orden creciente, las posiciones (índices de bit) presentes en la máscara."""
+    if mask.bit_length() <= WIDE_MASK_BITS:
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+        return
+    # En una máscara ancha cada mask ^= low copia el entero completo (tiempo cuadrático en
+    # el ancho): se convierte una sola vez a binario y se buscan los unos con rfind.
+    digits = bin(mask)
+    top = len(digits) - 1
+    i = len(digits)
+    while True:
+        i = digits.rfind('1', 2, i)
+        if i < 0:
+            return
+        yield top - i
+
+def mask_key(mask):
+    """
+    Clave de diccionario para una máscara de posiciones.
+    El hash de un entero de Python es su valor módulo 2**61 - 1, así que las máscaras de un
+    solo bit (1 << p) sólo tienen 61 hashes distintos y un diccionario indexado por máscaras
+    se degrada a tiempo cuadrático con miles de posiciones; agregar bit_length lo evita.
+    """
+    return mask.bit_length(), mask
+
+# Ventanas de posiciones.
+# Una máscara de posiciones es un entero tan ancho como su posición más alta, así que en una
+# concatenación de n símbolos cada followpos y cada estado ocuparían O(n) bits aunque sólo
+# contengan una o dos posiciones (memoria y tiempo cuadráticos). Una ventana (base, bits)
+# representa la máscara bits << base con el bit 0 de bits encendido: su tamaño es el de la
+# distancia entre su posición más baja y la más alta. La ventana vacía es (0, 0).
+EMPTY_WINDOW = (0, 0)
+
+def to_window(mask):
+    """Convierte una máscara de posiciones en ventana."""
+    if not mask:
+        return EMPTY_WINDOW
+    base = (mask & -mask).bit_length() - 1
+    return base, mask >> base
+
+def window_mask(window):
+    """Convierte una ventana en la máscara de posiciones equivalente."""
+    base, bits = window
+    return bits << base
+
+def window_union(a, b):
+    """Unión de dos ventanas."""
+    a_base, a_bits = a
+    b_base, b_bits = b
+    if not b_bits:
+        return a
+    if not a_bits:
+        return b
+    if a_base <= b_base:
+        return a_base, a_bits | (b_bits << (b_base - a_base))
+    return b_base, b_bits | (a_bits << (a_base - b_base))
+
+def iter_window(window):
+    """Produce, en orden creciente, las posiciones de la ventana."""
+    base, bits = window
+    for b in iter_bits(bits):
+        yield base + b
+
+def window_key(window):
+    """Clave de diccionario para una ventana (ver mask_key)."""
+    base, bits = window
+    return base, bits.bit_length(), bits
+
+def compute_position_masks(root):
+    """
+    Versión con bitsets de compute_functions y compute_followpos.
+
+    Recorre el AST en postorden (con pila explícita), numera las hojas desde 1 (en el mismo
+    orden que compute_functions, sin posición para ε) y calcula nullable, firstpos y lastpos como
+    ventanas de posiciones (ver to_window) sin guardarlas en los nodos. followpos se actualiza
+    con window_union.
+
+    Retorna:
+      - first: ventana de firstpos de la raíz.
+      - pos_dict: mapeo posición -> símbolo.
+      - followpos: lista donde followpos[p] es la ventana de followpos(p) (el índice 0 no se usa).
+    """
+    pos_dict = {}
+    followpos = [EMPTY_WINDOW]
+
+    # Pila de resultados (nullable, firstpos, lastpos) de los subárboles ya recorridos.
+    values = []
+    for node in iter_postorder(root):
+        if node.izquierdo is None and node.derecho is None:
+            if node.token_type == "LITERAL" and node.valor == EPSILON:
+                values.append((True, EMPTY_WINDOW, EMPTY_WINDOW))
+                continue
+            p = len(followpos)
+            followpos.append(EMPTY_WINDOW)
+            pos_dict[p] = node.valor
+            values.append((False, (p, 1), (p, 1)))
+            continue
+        if node.valor == '*' or node.valor == '+':
+            left_nullable, left_first, left_last = values.pop()
+            for p in iter_window(left_last):
+                followpos[p] = window_union(followpos[p], left_first)
+            values.append((node.valor == '*' or left_nullable, left_first, left_last))
+            continue
+        right_nullable, right_first, right_last = values.pop()
+        left_nullable, left_first, left_last = values.pop()
+        if node.valor == '|':
+            values.append((left_nullable or right_nullable, window_union(left_first, right_first),
+                           window_union(left_last, right_last)))
+        elif node.valor == '.':
+            for p in iter_window(left_last):
+                followpos[p] = window_union(followpos[p], right_first)
+            first = window_union(left_first, right_first) if left_nullable else left_first
+            last = window_union(left_last, right_last) if right_nullable else right_last
+            values.append((left_nullable and right_nullable, first, last))
+        else:
+            raise ValueError(f"Operador desconocido en compute_position_masks: {node.valor}")
+
+    _, first, _ = values[0]
+    return first, pos_dict, followpos
+
+def compact_position_masks(ast):
+    """
+    Versión de compute_position_masks para el árbol compacto (compactAST.CompactAST).
+
+    Recorre los índices en postorden con una pila explícita (como iter_postorder) y guarda
+    nullable, firstpos y lastpos sólo en la pila de resultados: cada máscara se descarta en
+    cuanto el padre la usa, así que nunca hay más máscaras vivas que la profundidad del árbol
+    (recorrer los índices en orden creciente mantendría vivas las de todos los operandos de
+    una cadena hasta crear su padre). Las hojas se numeran desde 1 de izquierda a derecha.
+
+    Retorna lo mismo que compute_position_masks: (first, pos_dict, followpos), con ventanas.
+    """
+    kinds, values, left, right = ast.kinds, ast.values, ast.left, ast.right
+    pos_dict = {}
+    followpos = [EMPTY_WINDOW]
+
+    values_stack = []
+    stack = [(ast.root, False)]
+    while stack:
+        i, expanded = stack.pop()
+        if kinds[i] != OPERATOR:
+            if kinds[i] == LITERAL and values[i] == EPSILON:
+                values_stack.append((True, EMPTY_WINDOW, EMPTY_WINDOW))
+                continue
+            p = len(followpos)
+            followpos.append(EMPTY_WINDOW)
+            pos_dict[p] = values[i]
+            values_stack.append((False, (p, 1), (p, 1)))
+            continue
+        if not expanded:
+            stack.append((i, True))
+            if right[i] != NO_CHILD:
+                stack.append((right[i], False))
+            stack.append((left[i], False))
+            continue
+        op = values[i]
+        if op == '*' or op == '+':
+            left_nullable, left_first, left_last = values_stack.pop()
+            for p in iter_window(left_last):
+                followpos[p] = window_union(followpos[p], left_first)
+            values_stack.append((op == '*' or left_nullable, left_first, left_last))
+            continue
+        right_nullable, right_first, right_last = values_stack.pop()
+        left_nullable, left_first, left_last = values_stack.pop()
+        if op == '|':
+            values_stack.append((left_nullable or right_nullable, window_union(left_first, right_first),
+                                 window_union(left_last, right_last)))
+        elif op == '.':
+            for p in iter_window(left_last):
+                followpos[p] = window_union(followpos[p], right_first)
+            first = window_union(left_first, right_first) if left_nullable else left_first
+            last = window_union(left_last, right_last) if right_nullable else right_last
+            values_stack.append((left_nullable and right_nullable, first, last))
+        else:
+            raise ValueError(f"Operador desconocido en compact_position_masks: {op}")
+
+    _, first, _ = values_stack[0]
+    return first, pos_dict, followpos
+
+def build_dfa_masks(first, pos_dict, followpos, unanchored=False):
+    """
+    Versión con bitsets de build_dfa: cada estado es una ventana de posiciones (ver to_window)
+    y se identifica con un número en el orden en que se descubre (el estado inicial es el 0).
+
+    Las posiciones se agrupan por clase de caracteres una sola vez (position_classes), y el
+    sucesor de un estado con una clase es la unión de followpos de sus posiciones en esa clase.
+
+    Retorna:
+      - transitions: diccionario { id: { etiqueta: id_destino, ... }, ... }.
+      - accepting_states: conjunto de ids de estados que contienen el marcador '$'.
+      - state_masks: lista id -> ventana de posiciones del estado.
+    """
+    class_labels, classes_of_pos = position_classes(pos_dict)
+    n_positions = len(followpos)
+    pos_classes = [classes_of_pos.get(p, ()) for p in range(n_positions)]
+    is_marker = bytearray(n_positions)
+    for p, symbol in pos_dict.items():
+        if symbol == '$':
+            is_marker[p] = 1
+
+    state_ids = {window_key(first): 0}
+    state_masks = [first]
+    transitions = {}
+    accepting_states = set()
+    unmarked = [0]
+    while unmarked:
+        state_id = unmarked.pop()
+        trans = transitions[state_id] = {}
+        # Acumular, por clase, la unión de followpos de las posiciones del estado.
+        moves = {}
+        for p in iter_window(state_masks[state_id]):
+            if is_marker[p]:
+                accepting_states.add(state_id)
+            follow = followpos[p]
+            if not follow[1]:
+                continue
+            for cls in pos_classes[p]:
+                move = moves.get(cls)
+                moves[cls] = follow if move is None else window_union(move, follow)
+        alphabet = range(len(class_labels)) if unanchored else sorted(moves)
+        for cls in alphabet:
+            new_state = moves.get(cls, EMPTY_WINDOW)
+            if unanchored:
+                new_state = window_union(new_state, first)
+            if not new_state[1]:
+                continue
+            key = window_key(new_state)
+            new_id = state_ids.get(key)
+            if new_id is None:
+                new_id = state_ids[key] = len(state_masks)
+                state_masks.append(new_state)
+                unmarked.append(new_id)
+            trans[class_labels[cls]] = new_id
+    return transitions, accepting_states, state_masks
+
+def direct_dfa_bitset(root, unanchored=False):
+    """
+    Construye el AFD directo (no minimizado) con el motor de bitsets.
+
+    Retorna:
+      - transitions: diccionario { id: { etiqueta: id_destino } } (listo para minimize_dfa).
+      - accepting_states: conjunto de ids de estados finales.
+      - state_masks: lista id -> ventana de posiciones.
+      - pos_dict: mapeo posición -> símbolo.
+      - followpos: lista posición -> ventana de followpos.
+    """
+    first, pos_dict, followpos = compute_position_masks(root)
+    transitions, accepting_states, state_masks = build_dfa_masks(first, pos_dict, followpos, unanchored)
+    return transitions, accepting_states, state_masks, pos_dict, followpos
+
+def direct_dfa_from_ast(root, unanchored=False):
     """
     Función principal que, a partir del AST (ya construido en syToSyntaxTree.py),
     calcula las funciones calculadas (nullable, firstpos, lastpos) y followpos,
     y luego construye el AFD directo (no minimizado) utilizando el método followpos.
+    Con unanchored=True se construye el AFD de búsqueda Σ*·R (ver build_dfa).
+    El cálculo se hace con el motor de bitsets (direct_dfa_bitset) y el resultado se
+    convierte al formato con conjuntos que usan main.py y graphAFD.py.
     
     Retorna:
       - dfa_states: mapeo de estados (frozenset) a números de estado.
@@ -154,14 +461,16 @@ def direct_dfa_from_ast(root):
       - pos_dict: mapeo posición -> símbolo.
       - followpos: tabla followpos (diccionario: posición -> conjunto de posiciones).
     """
-    pos_counter = [1]      # Contador mutable para asignar posiciones (comienza en 1)
-    pos_dict = {}          # Diccionario: posición -> símbolo
-    # Calcular funciones en el AST
-    compute_functions(root, pos_counter, pos_dict)
-    # Inicializar la tabla followpos
-    followpos = defaultdict(set)
-    compute_followpos(root, followpos)
+    id_transitions, accepting_states, state_masks, pos_dict, follow_masks = direct_dfa_bitset(root, unanchored)
 
-    # Construir el DFA a partir del AST y de la tabla followpos
-    dfa_states, transitions, accepting_states = build_dfa(root, pos_dict, followpos)
+    # Convertir las ventanas a frozensets de posiciones.
+    states = [frozenset(iter_window(window)) for window in state_masks]
+    dfa_states = {state: state_id for state_id, state in enumerate(states)}
+    transitions = {}
+    for state_id, trans in id_transitions.items():
+        transitions[states[state_id]] = {symbol: states[dest] for symbol, dest in trans.items()}
+    followpos = defaultdict(set)
+    for p, window in enumerate(follow_masks):
+        if window[1]:
+            followpos[p] = set(iter_window(window))
     return dfa_states, transitions, accepting_states, pos_dict, followpos
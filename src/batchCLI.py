@@ -0,0 +1,158 @@
+"""
+Punto de entrada no interactivo: compila patrones y evalúa archivos de registros sin
+visualización ni impresión de estados.
+
+A diferencia de main.py, no lee nada con input(), no genera imágenes (graphviz sólo se
+importa si se pide --render) y escribe los resultados como líneas JSON o CSV.
+
+Por cada par (patrón, entrada) se emite una fila con total, accepted y rejected; con
+--matches se emite además una fila por cada registro aceptado (número de línea y texto).
+Los patrones inválidos producen una fila con el error y el código de salida es 2.
+
+Uso:
+    python batchCLI.py -e "[a-z]+" -e "(0|1)*" datos.txt otro.txt
+    python batchCLI.py --patterns-file patrones.txt --format csv --matches -    (entrada estándar)
+    python batchCLI.py -e "ab|b" -s ab -s b -s c
+    python batchCLI.py -e "[a-z]+" --export grafos --export-format json datos.txt
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+
+from compileRegex import build_minimized_dfa
+from simulateDFA import CompiledDFA, iter_records
+
+SUMMARY_FIELDS = ["pattern", "input", "total", "accepted", "rejected", "error"]
+CSV_FIELDS = SUMMARY_FIELDS + ["line", "text"]
+STRINGS_INPUT = "<args>"
+STDIN_INPUT = "-"
+
+class JsonLinesWriter:
+    """Escribe cada fila como un objeto JSON por línea."""
+
+    def __init__(self, out):
+        self.out = out
+
+    def write(self, kind, row):
+        self.out.write(json.dumps({"kind": kind, **row}, ensure_ascii=False) + "\n")
+
+class CsvWriter:
+    """Escribe las filas como CSV; la primera columna indica el tipo de fila (summary o match)."""
+
+    def __init__(self, out):
+        self.writer = csv.writer(out)
+        self.writer.writerow(["kind"] + CSV_FIELDS)
+
+    def write(self, kind, row):
+        self.writer.writerow([kind] + ["" if row.get(f) is None else row.get(f) for f in CSV_FIELDS])
+
+def read_patterns(args):
+    """Retorna la lista de patrones de -e y de --patterns-file (una expresión por línea)."""
+    patterns = list(args.regex or [])
+    if args.patterns_file:
+        for line in iter_records(args.patterns_file, args.encoding):
+            if line:
+                patterns.append(line)
+    return patterns
+
+def compile_pattern(regex, cache):
+    """Compila un patrón (usando la caché de disco si se indicó) y retorna su CompiledDFA."""
+    dfa = cache.get_or_compile(regex) if cache is not None else build_minimized_dfa(regex)
+    return dfa, CompiledDFA(*dfa)
+
+def input_records(name, args):
+    """Produce los registros de una entrada: archivo, entrada estándar o cadenas de -s."""
+    if name == STRINGS_INPUT:
+        yield from args.string
+    elif name == STDIN_INPUT:
+        for line in sys.stdin:
+            if line.endswith("\n"):
+                line = line[:-2] if line.endswith("\r\n") else line[:-1]
+            yield line
+    else:
+        yield from iter_records(name, args.encoding)
+
+def run(args, out):
+    """Ejecuta el lote y retorna el código de salida."""
+    writer = CsvWriter(out) if args.format == "csv" else JsonLinesWriter(out)
+    cache = None
+    if args.cache:
+        from dfaCache import DiskCache
+        cache = DiskCache(args.cache)
+
+    inputs = list(args.inputs)
+    if args.string:
+        inputs.insert(0, STRINGS_INPUT)
+    if not inputs:
+        inputs = [STDIN_INPUT]
+    patterns = read_patterns(args)
+    # La entrada estándar sólo puede leerse una vez: se guarda en memoria sólo si hay varios
+    # patrones; con uno solo se procesa directamente, línea por línea.
+    buffer_stdin = len(patterns) > 1
+    stdin_records = None
+
+    status = 0
+    for k, regex in enumerate(patterns):
+        try:
+            dfa, compiled = compile_pattern(regex, cache)
+        except ValueError as e:
+            status = 2
+            writer.write("summary", {"pattern": regex, "error": str(e)})
+            continue
+        if args.render:
+            from graphMinimizedAFD import graph_minimized_dfa
+            graph_minimized_dfa(*dfa, filename=os.path.join(args.render, f"dfa_{k}"), open_image=False)
+        if args.export:
+            from exportDFA import write_dot, write_json
+            write = write_json if args.export_format == "json" else write_dot
+            write(os.path.join(args.export, f"dfa_{k}.{args.export_format}"), *dfa)
+
+        fullmatch = compiled.fullmatch
+        for name in inputs:
+            if name == STDIN_INPUT and buffer_stdin:
+                if stdin_records is None:
+                    stdin_records = list(input_records(name, args))
+                records = stdin_records
+            else:
+                records = input_records(name, args)
+            total = 0
+            accepted = 0
+            for line, record in enumerate(records):
+                total += 1
+                if fullmatch(record):
+                    accepted += 1
+                    if args.matches:
+                        writer.write("match", {"pattern": regex, "input": name, "line": line, "text": record})
+            writer.write("summary", {"pattern": regex, "input": name, "total": total,
+                                     "accepted": accepted, "rejected": total - accepted})
+    return status
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluación por lotes de expresiones regulares (sin visualización)")
+    parser.add_argument("inputs", nargs="*", help="archivos de registros (una cadena por línea); '-' es la entrada estándar")
+    parser.add_argument("-e", "--regex", action="append", help="expresión regular (puede repetirse)")
+    parser.add_argument("--patterns-file", help="archivo con una expresión regular por línea")
+    parser.add_argument("-s", "--string", action="append", help="cadena a evaluar (puede repetirse)")
+    parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl")
+    parser.add_argument("--matches", action="store_true", help="emitir una fila por cada registro aceptado")
+    parser.add_argument("--encoding", default="utf-8")
+    parser.add_argument("--cache", help="directorio de la caché de DFA compilados")
+    parser.add_argument("--render", help="directorio donde graficar cada DFA minimizado (requiere graphviz)")
+    parser.add_argument("--export", help="directorio donde exportar cada DFA minimizado (sin graphviz)")
+    parser.add_argument("--export-format", choices=["dot", "json"], default="dot")
+    parser.add_argument("--output", help="archivo de salida (por defecto, salida estándar)")
+    args = parser.parse_args(argv)
+    if not args.regex and not args.patterns_file:
+        parser.error("se requiere al menos un patrón (-e o --patterns-file)")
+
+    if args.output:
+        newline = "" if args.format == "csv" else None
+        with open(args.output, "w", encoding="utf-8", newline=newline) as out:
+            return run(args, out)
+    return run(args, sys.stdout)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+"""
+Benchmark de la función generada (codegenDFA) frente al intérprete con tabla (CompiledDFA).
+
+Para DFA de tamaño creciente (la familia (a|b)*a(a|b)^k, con 2^(k+1) estados) y algunos
+patrones pequeños típicos, mide el tiempo de evaluar las mismas cadenas aleatorias con
+CompiledDFA.fullmatch y con la función generada, y reporta la aceleración.
+
+Uso:
+    python benchCodegen.py [--max-k 8] [--strings 2000] [--length 200] [--seed 0]
+"""
+
+import argparse
+import random
+import time
+
+from compileRegex import build_minimized_dfa
+from codegenDFA import compile_matcher
+from simulateDFA import CompiledDFA
+
+SMALL_PATTERNS = [
+    ("[a-z]+[@][a-z]+\\.[a-z]+", "abcxyz@."),
+    ("(0|1|2|3|4|5|6|7|8|9)+", "0123456789"),
+    ("(a|b)*abb", "ab"),
+]
+
+def time_matcher(fullmatch, strings):
+    start = time.perf_counter()
+    accepted = 0
+    for s in strings:
+        if fullmatch(s):
+            accepted += 1
+    return time.perf_counter() - start, accepted
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de codegenDFA frente a CompiledDFA")
+    parser.add_argument("--max-k", type=int, default=8)
+    parser.add_argument("--strings", type=int, default=2000)
+    parser.add_argument("--length", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    cases = list(SMALL_PATTERNS)
+    cases.extend(("(a|b)*a" + "(a|b)" * k, "ab") for k in range(args.max_k + 1))
+
+    print(f"{'patrón':<40}{'estados':>9}{'tabla (s)':>12}{'codegen (s)':>13}{'aceleración':>13}")
+    for regex, alphabet in cases:
+        dfa = build_minimized_dfa(regex)
+        table_dfa = CompiledDFA(*dfa)
+        generated = compile_matcher(*dfa)
+        strings = ["".join(rng.choice(alphabet) for _ in range(args.length)) for _ in range(args.strings)]
+        t_table, acc_table = time_matcher(table_dfa.fullmatch, strings)
+        t_codegen, acc_codegen = time_matcher(generated, strings)
+        if acc_table != acc_codegen:
+            raise RuntimeError(f"Resultados distintos para {regex!r}.")
+        label = regex if len(regex) <= 38 else regex[:35] + "..."
+        print(f"{label:<40}{table_dfa.n_states:>9}{t_table:>12.3f}{t_codegen:>13.3f}{t_table / t_codegen:>13.2f}")
+
+if __name__ == "__main__":
+    main()
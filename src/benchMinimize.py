@@ -0,0 +1,68 @@
+"""
+Benchmark de escalabilidad para minimize_dfa (AFDtoMinimizedAFD.py).
+
+Genera AFD aleatorios (parciales) y AFD en forma de cadena (el peor caso clásico de
+particiones sucesivas) de tamaño creciente, mide el tiempo de minimización y reporta
+el cociente t / (m log2 n), que debe mantenerse aproximadamente constante si el
+algoritmo escala como O(m log n).
+
+Uso:
+    python benchMinimize.py [--sizes 1000 10000 100000] [--symbols 4] [--seed 0]
+"""
+
+import argparse
+import math
+import random
+import time
+
+from AFDtoMinimizedAFD import minimize_dfa
+
+def random_dfa(n, n_symbols, density, rng):
+    """
+    AFD aleatorio con n estados: cada estado tiene transición con cada símbolo con
+    probabilidad `density` hacia un estado uniforme. Un 30% de estados son de aceptación.
+    """
+    symbols = [chr(ord('a') + i) for i in range(n_symbols)]
+    transitions = {}
+    for s in range(n):
+        transitions[s] = {c: rng.randrange(n) for c in symbols if rng.random() < density}
+    accepting = {s for s in range(n) if rng.random() < 0.3}
+    return transitions, accepting
+
+def chain_dfa(n):
+    """
+    AFD que reconoce exactamente la cadena a^(n-1): cada estado es distinguible,
+    por lo que la partición se refina hasta bloques unitarios.
+    """
+    transitions = {s: {'a': s + 1} for s in range(n - 1)}
+    transitions[n - 1] = {}
+    return transitions, {n - 1}
+
+def time_minimize(transitions, accepting):
+    m = sum(len(t) for t in transitions.values())
+    start = time.perf_counter()
+    _, _, _, _, P = minimize_dfa(transitions, accepting)
+    elapsed = time.perf_counter() - start
+    return elapsed, m, len(P)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de minimize_dfa")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000, 50000, 100000])
+    parser.add_argument("--symbols", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'familia':<10}{'n':>10}{'m':>10}{'bloques':>10}{'t (s)':>10}{'t/(m log n) (ns)':>20}")
+    for family in ("aleatorio", "cadena"):
+        for n in args.sizes:
+            if family == "aleatorio":
+                transitions, accepting = random_dfa(n, args.symbols, 0.9, rng)
+            else:
+                transitions, accepting = chain_dfa(n)
+            elapsed, m, blocks = time_minimize(transitions, accepting)
+            ratio = elapsed / (max(m, 1) * math.log2(max(n, 2))) * 1e9
+            print(f"{family:<10}{n:>10}{m:>10}{blocks:>10}{elapsed:>10.3f}{ratio:>20.1f}")
+
+if __name__ == "__main__":
+    main()
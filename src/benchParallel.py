@@ -0,0 +1,65 @@
+"""
+Benchmark de escalabilidad para parallel_fullmatch (parallelDFA.py).
+
+Genera un archivo aleatorio sobre el alfabeto del patrón, mide la simulación secuencial
+(stream_fullmatch) y la simulación especulativa con distinto número de procesos, y reporta
+la aceleración respecto a la secuencial.
+
+Uso:
+    python benchParallel.py [--size-mb 256] [--workers 1 2 4 8] [--regex "(a|b|c)*abc(a|b|c)*"]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from compileRegex import compile
+from parallelDFA import parallel_fullmatch
+from streamDFA import stream_fullmatch
+
+def write_random_file(path, size, alphabet, rng):
+    """Escribe size bytes aleatorios tomados de alphabet, en bloques de 1 MiB."""
+    block = 1 << 20
+    with open(path, "wb") as f:
+        remaining = size
+        while remaining > 0:
+            n = min(block, remaining)
+            f.write(bytes(rng.choice(alphabet) for _ in range(n)))
+            remaining -= n
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de parallel_fullmatch")
+    parser.add_argument("--size-mb", type=int, default=256)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--regex", default="(a|b|c)*abc(a|b|c)*")
+    parser.add_argument("--alphabet", default="abc")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    dfa = compile(args.regex)
+    size = args.size_mb << 20
+    rng = random.Random(args.seed)
+    fd, path = tempfile.mkstemp(suffix=".txt")
+    os.close(fd)
+    try:
+        write_random_file(path, size, args.alphabet.encode("latin-1"), rng)
+        start = time.perf_counter()
+        expected = stream_fullmatch(dfa, path)
+        sequential = time.perf_counter() - start
+        print(f"estados: {dfa.n_states}  tamaño: {args.size_mb} MiB  CPUs: {os.cpu_count()}")
+        print(f"{'procesos':>10}{'t (s)':>10}{'MiB/s':>10}{'aceleración':>14}")
+        print(f"{'secuencial':>10}{sequential:>10.3f}{args.size_mb / sequential:>10.1f}{1.0:>14.2f}")
+        for workers in args.workers:
+            start = time.perf_counter()
+            result = parallel_fullmatch(dfa, path, workers=workers, min_size=0)
+            elapsed = time.perf_counter() - start
+            if result != expected:
+                raise RuntimeError("parallel_fullmatch no coincide con la simulación secuencial.")
+            print(f"{workers:>10}{elapsed:>10.3f}{args.size_mb / elapsed:>10.1f}{sequential / elapsed:>14.2f}")
+    finally:
+        os.remove(path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""
+Benchmark por etapas del pipeline de compilación.
+
+Para cada familia de expresiones regulares y cada tamaño, mide el tiempo (mejor de
+--repeat ejecuciones) y el pico de memoria (tracemalloc, en una ejecución aparte para no
+afectar los tiempos) de cada etapa:
+  validar_regex -> tokenize -> insertar_operador_concatenacion_tokens -> infix_a_postfix_tokens
+  -> postfix_a_arbol_sintactico -> compute_position_masks (followpos) -> build_dfa_masks
+  -> minimize_dfa -> CompiledDFA
+La etapa parse_regex mide además el analizador de una sola pasada (regexParser), que produce
+el mismo árbol que las cinco primeras etapas juntas, y las etapas parse_compact_ast,
+simplify_ast y compact_position_masks el cálculo sobre el árbol compacto (compactAST) que usa
+compileRegex.build_minimized_dfa.
+
+Familias:
+  - concat: concatenación de n literales.
+  - wide_brackets: concatenación de n clases de caracteres anchas.
+  - nested_plus: n operadores '+' anidados.
+  - exponential: (a|b)*a(a|b)^n, cuyo AFD mínimo tiene 2^(n+1) estados.
+  - alternation: unión de n palabras distintas.
+
+Los resultados se escriben en JSON. Con --baseline se comparan con un archivo JSON previo
+y se reportan las etapas cuyo tiempo creció más que --threshold (el código de salida es 1
+si hay regresiones). Con --check-scaling se verifica además que la compilación de las
+familias lineales (LINEAR_FAMILIES) escale linealmente: entre tamaños consecutivos, el tiempo
+y el pico de memoria de las etapas de build_minimized_dfa (COMPILE_STAGES) no deben crecer
+más rápido que n ** --max-exponent (el código de salida es 1 si alguno lo hace).
+Si un caso falla (por ejemplo, con RecursionError en árboles muy profundos) se registra el
+error en lugar de los tiempos.
+
+Uso:
+    python benchStages.py [--families concat exponential] [--repeat 3] [--output resultados.json]
+                          [--baseline base.json] [--threshold 1.25]
+                          [--check-scaling] [--max-exponent 1.3]
+    python benchStages.py --families concat --sizes 25000 50000 100000 --check-scaling
+"""
+
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+import tracemalloc
+
+from validateRegex import validar_regex
+from regexToSY import tokenize, insertar_operador_concatenacion_tokens, infix_a_postfix_tokens
+from syToSyntaxTree import postfix_a_arbol_sintactico, add_end_marker
+from regexParser import parse_regex
+from compactAST import CompactAST
+from simplifyAST import simplify_ast
+from astToDFA import compute_position_masks, compact_position_masks, build_dfa_masks
+from AFDtoMinimizedAFD import minimize_dfa
+from simulateDFA import CompiledDFA
+
+RESULTS_VERSION = 1
+MIN_REGRESSION_SECONDS = 1e-3
+# Tiempo total mínimo para estimar el exponente de crecimiento (los tiempos menores son ruido).
+MIN_SCALING_SECONDS = 0.2
+
+def _word(i):
+    # Palabra distinta para cada i (base 26 sobre a-z).
+    letters = []
+    while True:
+        letters.append(chr(ord('a') + i % 26))
+        i //= 26
+        if not i:
+            return "".join(letters)
+
+FAMILIES = {
+    "concat": (lambda n: "".join(chr(ord('a') + i % 26) for i in range(n)),
+               [100, 1000, 5000]),
+    "wide_brackets": (lambda n: f"[a-z{chr(0x100)}-{chr(0xFFFF)}]" * n,
+                      [10, 100, 1000]),
+    "nested_plus": (lambda n: "(" * n + "a" + ")+" * n,
+                    [4, 8, 12]),
+    "exponential": (lambda n: "(a|b)*a" + "(a|b)" * n,
+                    [4, 8, 12]),
+    "alternation": (lambda n: "|".join(_word(i) for i in range(n)),
+                    [10, 100, 1000]),
+}
+
+# Familias cuya compilación debe ser lineal en n (ver check_scaling). alternation no se incluye:
+# simplify_ast factoriza las palabras, así que su número de posiciones no es proporcional a n.
+LINEAR_FAMILIES = ("concat", "wide_brackets")
+# Etapas que ejecuta compileRegex.build_minimized_dfa.
+COMPILE_STAGES = ("parse_compact_ast", "simplify_ast", "compact_position_masks", "build_dfa_masks",
+                  "minimize_dfa", "CompiledDFA")
+
+def run_stages(regex):
+    """
+    Ejecuta el pipeline etapa por etapa.
+    Retorna la lista [(nombre_etapa, función sin argumentos)] y, al invocarlas en orden,
+    cada una usa el resultado de las anteriores. Cada resultado intermedio se descarta después
+    de su último uso, para que los árboles de las primeras etapas no sigan vivos (y recorridos
+    por el recolector de basura) durante las siguientes.
+    """
+    state = {}
+
+    def validate():
+        if not validar_regex(regex, verbose=False):
+            raise ValueError(f"La expresión regular no es válida: {regex!r}")
+
+    def tokens():
+        state["tokens"] = tokenize(regex)
+
+    def concatenation():
+        state["tokens"] = insertar_operador_concatenacion_tokens(state["tokens"])
+
+    def postfix():
+        state["postfix"] = infix_a_postfix_tokens(state.pop("tokens"))
+
+    def tree():
+        state["tree"] = add_end_marker(postfix_a_arbol_sintactico(state.pop("postfix")))
+
+    def fused():
+        state["tree"] = add_end_marker(parse_regex(regex))
+
+    def compact():
+        ast = CompactAST()
+        parse_regex(regex, make=ast.add)
+        state["ast"] = ast
+
+    def simplify():
+        state["ast"], _ = simplify_ast(state["ast"])
+        state["ast"].add_end_marker()
+
+    def followpos():
+        state["positions"] = compute_position_masks(state.pop("tree"))
+
+    def compact_followpos():
+        state["positions"] = compact_position_masks(state.pop("ast"))
+
+    def build_dfa():
+        transitions, accepting, _ = build_dfa_masks(*state.pop("positions"))
+        state["dfa"] = (transitions, accepting)
+
+    def minimize():
+        state["minimized"] = minimize_dfa(*state.pop("dfa"))[:3]
+
+    def table():
+        state["compiled"] = CompiledDFA(*state.pop("minimized"))
+
+    stages = [("validar_regex", validate), ("tokenize", tokens),
+              ("insertar_operador_concatenacion_tokens", concatenation),
+              ("infix_a_postfix_tokens", postfix), ("postfix_a_arbol_sintactico", tree),
+              ("parse_regex", fused), ("parse_compact_ast", compact),
+              ("simplify_ast", simplify),
+              ("compute_position_masks", followpos), ("compact_position_masks", compact_followpos),
+              ("build_dfa_masks", build_dfa),
+              ("minimize_dfa", minimize), ("CompiledDFA", table)]
+    return stages, state
+
+def measure(regex, repeat):
+    """Retorna {etapa: {"time": segundos, "peak_bytes": bytes}} y el número de estados del AFD mínimo."""
+    times = {}
+    for _ in range(repeat):
+        stages, _ = run_stages(regex)
+        for name, stage in stages:
+            start = time.perf_counter()
+            stage()
+            elapsed = time.perf_counter() - start
+            times[name] = min(elapsed, times.get(name, elapsed))
+
+    peaks = {}
+    stages, state = run_stages(regex)
+    tracemalloc.start()
+    try:
+        for name, stage in stages:
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+            stage()
+            _, peak = tracemalloc.get_traced_memory()
+            peaks[name] = peak - base
+    finally:
+        tracemalloc.stop()
+    results = {name: {"time": times[name], "peak_bytes": peaks[name]} for name, _ in stages}
+    return results, state["compiled"].n_states
+
+def run_suite(families, repeat, sizes=None):
+    """Ejecuta las familias indicadas y retorna el diccionario de resultados (serializable a JSON)."""
+    entries = []
+    for family in families:
+        make_regex, default_sizes = FAMILIES[family]
+        for n in sizes or default_sizes:
+            regex = make_regex(n)
+            entry = {"family": family, "n": n, "regex_length": len(regex)}
+            entries.append(entry)
+            try:
+                stages, n_states = measure(regex, repeat)
+            except (RecursionError, MemoryError, ValueError) as e:
+                # Un fallo (por ejemplo, recursión demasiado profunda) también es un resultado.
+                entry["error"] = f"{type(e).__name__}: {e}"
+                print(f"{family:<15}{n:>7}   error: {entry['error']}", file=sys.stderr)
+                continue
+            entry["states"] = n_states
+            entry["stages"] = stages
+            total = sum(s["time"] for s in stages.values())
+            slowest = max(stages, key=lambda name: stages[name]["time"])
+            print(f"{family:<15}{n:>7}{n_states:>9}{total:>10.4f} s   etapa más lenta: {slowest}",
+                  file=sys.stderr)
+    return {"version": RESULTS_VERSION, "python": platform.python_version(), "repeat": repeat,
+            "results": entries}
+
+def compare(current, baseline, threshold):
+    """
+    Compara dos resultados de run_suite y retorna la lista de regresiones
+    (familia, n, etapa, tiempo_base, tiempo_actual) cuyo tiempo creció más que threshold.
+    Un caso que ahora termina con error se reporta con tiempo_actual infinito.
+    """
+    base_times = {(e["family"], e["n"], name): stage["time"]
+                  for e in baseline["results"] for name, stage in e.get("stages", {}).items()}
+    regressions = []
+    for e in current["results"]:
+        if "error" in e and (e["family"], e["n"], "minimize_dfa") in base_times:
+            # Un caso que antes terminaba y ahora falla cuenta como regresión.
+            regressions.append((e["family"], e["n"], e["error"], base_times[(e["family"], e["n"], "minimize_dfa")],
+                                float("inf")))
+            continue
+        for name, stage in e.get("stages", {}).items():
+            before = base_times.get((e["family"], e["n"], name))
+            if before is None:
+                continue
+            now = stage["time"]
+            if now > before * threshold and now - before > MIN_REGRESSION_SECONDS:
+                regressions.append((e["family"], e["n"], name, before, now))
+    return regressions
+
+def check_scaling(results, max_exponent, families=LINEAR_FAMILIES):
+    """
+    Verifica que las familias lineales escalen linealmente en los resultados de run_suite.
+
+    Para cada par de tamaños consecutivos n0 < n1 de una familia, estima el exponente k de
+    medida(n1) / medida(n0) = (n1 / n0) ** k para la suma de los tiempos y para el mayor pico de
+    memoria de las etapas de COMPILE_STAGES; los pares cuyo tiempo es menor que
+    MIN_SCALING_SECONDS se omiten.
+    Retorna la lista (familia, n0, n1, medida, exponente) de los que superan max_exponent.
+    """
+    by_family = {}
+    for e in results["results"]:
+        if e["family"] in families and "stages" in e:
+            stages = [e["stages"][name] for name in COMPILE_STAGES]
+            by_family.setdefault(e["family"], []).append(
+                (e["n"], sum(s["time"] for s in stages), max(s["peak_bytes"] for s in stages)))
+    violations = []
+    for family, entries in by_family.items():
+        entries.sort()
+        for (n0, time0, peak0), (n1, time1, peak1) in zip(entries, entries[1:]):
+            if n1 == n0 or time0 < MIN_SCALING_SECONDS:
+                continue
+            for measure, before, now in (("time", time0, time1), ("peak_bytes", peak0, peak1)):
+                if before <= 0 or now <= 0:
+                    continue
+                exponent = math.log(now / before) / math.log(n1 / n0)
+                if exponent > max_exponent:
+                    violations.append((family, n0, n1, measure, exponent))
+    return violations
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark por etapas del pipeline de compilación")
+    parser.add_argument("--families", nargs="+", choices=sorted(FAMILIES), default=list(FAMILIES))
+    parser.add_argument("--sizes", type=int, nargs="+", help="tamaños (reemplaza los de cada familia)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="archivo JSON de salida (por defecto, salida estándar)")
+    parser.add_argument("--baseline", help="archivo JSON con resultados previos para comparar")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    parser.add_argument("--check-scaling", action="store_true",
+                        help="verificar que las familias lineales escalen linealmente")
+    parser.add_argument("--max-exponent", type=float, default=1.3)
+    args = parser.parse_args()
+
+    results = run_suite(args.families, args.repeat, args.sizes)
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    failed = False
+    if args.check_scaling:
+        violations = check_scaling(results, args.max_exponent)
+        for family, n0, n1, measure, exponent in violations:
+            print(f"NO LINEAL {family} n={n0} -> n={n1} {measure}: crece como n^{exponent:.2f}",
+                  file=sys.stderr)
+        if violations:
+            failed = True
+        else:
+            print("Las familias lineales escalan linealmente.", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for family, n, stage, before, now in regressions:
+            print(f"REGRESIÓN {family} n={n} {stage}: {before:.4f} s -> {now:.4f} s ({now / before:.2f}x)",
+                  file=sys.stderr)
+        if regressions:
+            failed = True
+        else:
+            print("Sin regresiones respecto a la línea base.", file=sys.stderr)
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Compilación masiva de conjuntos de expresiones regulares en un pool de procesos.
+
+Cada patrón pasa por el pipeline de compileRegex (parse_regex -> AFD directo -> minimize_dfa)
+en un proceso del pool, y el resultado vuelve serializado con dfaCache.serialize_dfa: unos
+pocos bytes que se transfieren entre procesos (y se guardan en disco) mucho más barato que
+los diccionarios del DFA.
+
+Los errores de cada patrón (los ValueError de la validación, pero también MemoryError o
+cualquier otra excepción) se reportan en su resultado sin interrumpir el lote, y cada patrón
+tiene un tiempo límite (con SIGALRM / setitimer, disponible en sistemas Unix) para que una
+expresión patológica no detenga la carga completa.
+"""
+
+import os
+import signal
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from compileRegex import build_minimized_dfa
+from dfaCache import deserialize_dfa, normalize_regex, serialize_dfa
+from simulateDFA import CompiledDFA
+
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_BATCH_SIZE = 16
+
+class CompileTimeout(Exception):
+    """La compilación de un patrón superó su tiempo límite."""
+
+class CompileResult:
+    """
+    Resultado de compilar un patrón.
+      - regex: la expresión regular.
+      - data: bytes de serialize_dfa, o None si hubo error.
+      - error: mensaje de error, o None si la compilación fue exitosa.
+    """
+    __slots__ = ("regex", "data", "error")
+
+    def __init__(self, regex, data=None, error=None):
+        self.regex = regex
+        self.data = data
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def load(self):
+        """Retorna (new_initial, new_transitions, new_accepting) del patrón."""
+        if self.error is not None:
+            raise ValueError(self.error)
+        return deserialize_dfa(self.data)
+
+    def compiled(self):
+        """Retorna el CompiledDFA del patrón."""
+        return CompiledDFA(*self.load())
+
+    def __repr__(self):
+        status = "ok" if self.ok else f"error={self.error!r}"
+        return f"CompileResult({self.regex!r}, {status})"
+
+def _raise_timeout(signum, frame):
+    raise CompileTimeout()
+
+def _timer_available():
+    return hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+
+def compile_serialized(regex, timeout=DEFAULT_TIMEOUT):
+    """
+    Compila un patrón y retorna (data, error): data son los bytes de serialize_dfa, o None si
+    hubo error. Con timeout (segundos) se interrumpe la compilación si lo supera; el límite
+    sólo se aplica en el hilo principal de sistemas con setitimer.
+    """
+    use_timer = timeout is not None and _timer_available()
+    if use_timer:
+        previous = signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        key = normalize_regex(regex)
+        return serialize_dfa(key, *build_minimized_dfa(regex)), None
+    except CompileTimeout:
+        return None, f"Tiempo límite de compilación excedido ({timeout} s)."
+    except Exception as e:
+        # Cualquier error del patrón (incluidos RecursionError y MemoryError) se reporta en
+        # su resultado en lugar de interrumpir el lote.
+        return None, f"{type(e).__name__}: {e}"
+    finally:
+        if use_timer:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+
+def _compile_batch(task):
+    batch, timeout = task
+    return [compile_serialized(regex, timeout) for regex in batch]
+
+def compile_many(patterns, workers=None, timeout=DEFAULT_TIMEOUT, batch_size=DEFAULT_BATCH_SIZE, cache=None):
+    """
+    Compila una lista de patrones en paralelo.
+
+    Parámetros:
+      - patterns: iterable de expresiones regulares.
+      - workers: número de procesos (por defecto, os.cpu_count()); con 1 se compila en este proceso.
+      - timeout: tiempo límite en segundos por patrón (None para no limitar).
+      - batch_size: patrones por tarea enviada al pool.
+      - cache: DiskCache opcional; los patrones presentes no se recompilan y los compilados
+        con éxito se guardan en ella.
+
+    Retorna:
+      - Lista de CompileResult en el mismo orden que patterns.
+    """
+    patterns = list(patterns)
+    results = [None] * len(patterns)
+    pending = []
+    for i, regex in enumerate(patterns):
+        data = None
+        if cache is not None:
+            try:
+                data = cache.load_serialized(regex)
+            except Exception as e:
+                results[i] = CompileResult(regex, error=f"{type(e).__name__}: {e}")
+                continue
+        if data is not None:
+            results[i] = CompileResult(regex, data)
+        else:
+            pending.append(i)
+
+    batches = [pending[k:k + batch_size] for k in range(0, len(pending), batch_size)]
+    tasks = [([patterns[i] for i in batch], timeout) for batch in batches]
+
+    def collect(outputs):
+        for batch, output in zip(batches, outputs):
+            for i, (data, error) in zip(batch, output):
+                results[i] = CompileResult(patterns[i], data, error)
+                if cache is not None and data is not None:
+                    cache.store_serialized(normalize_regex(patterns[i]), data)
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) <= 1:
+        collect(map(_compile_batch, tasks))
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            collect(pool.map(_compile_batch, tasks))
+    return results
@@ -0,0 +1,126 @@
+"""
+Generación de código: convierte un DFA minimizado en una función de Python especializada.
+
+A partir de (new_initial, new_transitions, new_accepting) de minimize_dfa se genera el código
+fuente de una función fullmatch(s) donde cada estado es un bloque de código y cada transición
+una comparación precalculada:
+  - Cada bloque consume caracteres con un ciclo for sobre un único iterador de la cadena.
+    Los lazos (transiciones de un estado a sí mismo) continúan el ciclo sin volver a despachar
+    el estado; por ejemplo [a-z]+ recorre la cadena en un solo ciclo.
+  - Las etiquetas con el mismo destino se unen en una sola condición: una comparación para un
+    carácter y una pertenencia a un frozenset constante para clases (comparaciones de rangos
+    si la clase es muy ancha).
+  - Las transiciones hacia estados desde los que no se alcanza la aceptación se omiten y el
+    bloque retorna False directamente.
+
+El código se compila una sola vez con compile()/exec. El despacho entre estados es una cadena
+de comparaciones, por lo que conviene para patrones pequeños y muy usados; para DFA grandes
+el intérprete con tabla de CompiledDFA es más rápido (ver benchCodegen.py).
+
+El código fuente generado puede guardarse en la caché de disco junto al DFA (dfaCache).
+"""
+
+from symbolClasses import label_ranges, normalize_ranges
+
+CODEGEN_VERSION = 1
+SET_MAX_CHARS = 1024
+
+def _live_states(new_transitions, new_accepting):
+    # Estados desde los que se alcanza un estado de aceptación.
+    predecessors = {}
+    for s, trans in new_transitions.items():
+        for dest in trans.values():
+            predecessors.setdefault(dest, set()).add(s)
+    live = set(new_accepting)
+    stack = list(live)
+    while stack:
+        for s in predecessors.get(stack.pop(), ()):
+            if s not in live:
+                live.add(s)
+                stack.append(s)
+    return live
+
+def _condition(ranges, var, constants):
+    # Expresión de Python que es verdadera si el carácter var pertenece a los rangos.
+    if len(ranges) == 1 and ranges[0][0] == ranges[0][1]:
+        return f"{var} == {chr(ranges[0][0])!r}"
+    size = sum(hi - lo + 1 for lo, hi in ranges)
+    if size <= SET_MAX_CHARS:
+        name = f"_C{len(constants)}"
+        constants.append((name, "".join(chr(code) for lo, hi in ranges for code in range(lo, hi + 1))))
+        return f"{var} in {name}"
+    parts = []
+    for lo, hi in ranges:
+        if lo == hi:
+            parts.append(f"{var} == {chr(lo)!r}")
+        else:
+            parts.append(f"{chr(lo)!r} <= {var} <= {chr(hi)!r}")
+    return " or ".join(parts)
+
+def generate_source(new_initial, new_transitions, new_accepting, name="fullmatch"):
+    """
+    Genera el código fuente de una función name(s) que retorna True si la cadena s completa
+    es aceptada por el DFA minimizado.
+    """
+    live = _live_states(new_transitions, new_accepting)
+    states = [new_initial] + [s for s in new_transitions if s != new_initial and s in live]
+    number = {s: k for k, s in enumerate(states)}
+    constants = []
+    body = []
+    for s in states:
+        k = number[s]
+        body.append(f"        {'if' if k == 0 else 'elif'} state == {k}:")
+        if s not in live:
+            body.append("            return False")
+            continue
+        # Unir las etiquetas que llevan al mismo destino en una sola condición; el lazo va primero.
+        by_dest = {}
+        for sym, dest in new_transitions.get(s, {}).items():
+            if dest in live:
+                by_dest.setdefault(dest, []).extend(label_ranges(sym))
+        branches = sorted(by_dest.items(), key=lambda item: item[0] != s)
+        body.append("            for c in it:")
+        for dest, ranges in branches:
+            body.append(f"                if {_condition(normalize_ranges(ranges), 'c', constants)}:")
+            if dest == s:
+                body.append("                    continue")
+            else:
+                body.append(f"                    state = {number[dest]}")
+                body.append("                    break")
+        body.append("                return False")
+        body.append("            else:")
+        body.append(f"                return {s in new_accepting}")
+
+    lines = [f"# Generado por codegenDFA (versión {CODEGEN_VERSION}); no editar.", ""]
+    for const_name, chars in constants:
+        lines.append(f"{const_name} = frozenset({chars!r})")
+    if constants:
+        lines.append("")
+    lines.append(f"def {name}(s):")
+    lines.append("    it = iter(s)")
+    lines.append("    state = 0")
+    lines.append("    while True:")
+    lines.extend(body)
+    lines.append("")
+    return "\n".join(lines)
+
+def load_matcher(source, name="fullmatch"):
+    """Compila el código fuente generado y retorna la función name."""
+    namespace = {}
+    exec(compile(source, f"<codegenDFA:{name}>", "exec"), namespace)
+    return namespace[name]
+
+def compile_matcher(new_initial, new_transitions, new_accepting):
+    """Genera y compila la función especializada de un DFA minimizado."""
+    return load_matcher(generate_source(new_initial, new_transitions, new_accepting))
+
+def cached_matcher(regex, cache):
+    """
+    Retorna la función especializada de regex usando la caché de disco (DiskCache): el DFA y
+    el código fuente se leen de la caché si existen, y en otro caso se generan y se guardan.
+    """
+    source = cache.load_source(regex, CODEGEN_VERSION)
+    if source is None:
+        source = generate_source(*cache.get_or_compile(regex))
+        cache.store_source(regex, CODEGEN_VERSION, source)
+    return load_matcher(source)
@@ -0,0 +1,81 @@
+"""
+Representación compacta del árbol sintáctico en arreglos paralelos.
+
+Cada nodo es un índice y sus datos se guardan en cuatro arreglos:
+  - kinds: tipo de token (LITERAL, BRACKET u OPERATOR), un byte por nodo.
+  - values: símbolo, etiqueta de la clase o operador.
+  - left / right: índices de los hijos (NO_CHILD si no hay), enteros de 32 bits.
+Los hijos siempre tienen un índice menor que su padre y la raíz es el último nodo, así que un
+recorrido por índices crecientes procesa los hijos antes que el padre sin pila ni recursión.
+
+Un nodo ocupa unos 17 bytes más el puntero a su valor, frente a los 72 bytes (más los
+conjuntos de compute_functions) de un Nodo. CompactAST.add tiene los mismos parámetros que
+Nodo, por lo que regexParser.parse_regex(regex, make=ast.add) construye el árbol directamente
+en los arreglos, sin crear objetos Nodo.
+"""
+
+from array import array
+
+from syToSyntaxTree import Nodo, iter_postorder
+
+TOKEN_TYPES = ("LITERAL", "BRACKET", "OPERATOR")
+LITERAL, BRACKET, OPERATOR = range(3)
+NO_CHILD = -1
+
+_KIND_OF = {name: kind for kind, name in enumerate(TOKEN_TYPES)}
+
+class CompactAST:
+    """
+    Árbol sintáctico en arreglos paralelos (ver el docstring del módulo).
+
+    Atributos:
+      - kinds, values, left, right: arreglos indexados por nodo.
+    """
+    __slots__ = ("kinds", "values", "left", "right")
+
+    def __init__(self):
+        self.kinds = bytearray()
+        self.values = []
+        self.left = array('i')
+        self.right = array('i')
+
+    def add(self, valor, token_type=None, izquierdo=None, derecho=None):
+        """Agrega un nodo (mismos parámetros que Nodo, con índices como hijos) y retorna su índice."""
+        self.kinds.append(_KIND_OF[token_type])
+        self.values.append(valor)
+        self.left.append(NO_CHILD if izquierdo is None else izquierdo)
+        self.right.append(NO_CHILD if derecho is None else derecho)
+        return len(self.values) - 1
+
+    def __len__(self):
+        return len(self.values)
+
+    @property
+    def root(self):
+        """Índice de la raíz (el último nodo agregado)."""
+        return len(self.values) - 1
+
+    def add_end_marker(self):
+        """Agrega el marcador de fin '$' como (R . $) y retorna el índice de la nueva raíz."""
+        root = self.root
+        return self.add('.', "OPERATOR", root, self.add('$', "LITERAL"))
+
+    @classmethod
+    def from_tree(cls, root):
+        """Convierte un árbol de Nodo a la representación compacta (las hojas conservan su orden)."""
+        ast = cls()
+        index = {}
+        for node in iter_postorder(root):
+            left = index.pop(id(node.izquierdo)) if node.izquierdo is not None else None
+            right = index.pop(id(node.derecho)) if node.derecho is not None else None
+            index[id(node)] = ast.add(node.valor, node.token_type, left, right)
+        return ast
+
+    def to_tree(self):
+        """Reconstruye el árbol de Nodo (por ejemplo, para visualizarlo o imprimirlo)."""
+        nodes = []
+        for i, value in enumerate(self.values):
+            left = nodes[self.left[i]] if self.left[i] != NO_CHILD else None
+            right = nodes[self.right[i]] if self.right[i] != NO_CHILD else None
+            nodes.append(Nodo(value, TOKEN_TYPES[self.kinds[i]], left, right))
+        return nodes[-1]
@@ -0,0 +1,202 @@
+"""
+Pipeline completo de compilación de una expresión regular, sin impresión ni visualización:
+parse_regex (validación y árbol en una pasada) -> simplify_ast -> compact_position_masks -> build_dfa_masks -> minimize_dfa.
+
+Es el mismo proceso que realiza main.py, pensado para usarse como biblioteca. A diferencia
+de main.py, el marcador de fin '$' se agrega al árbol (R . $) y no al texto, de modo que
+también aplica a todas las alternativas de R (por ejemplo, "ab|b").
+
+'#' sin escapar es la cadena vacía (ε); el carácter '#' se escribe "\#" o "[#]".
+
+compile(regex) es la puerta de entrada memoizada: retorna un CompiledDFA compartido desde una
+caché LRU acotada, de modo que compilar de nuevo un patrón ya visto cuesta una búsqueda en
+un diccionario.
+"""
+
+import threading
+from collections import OrderedDict
+from contextlib import nullcontext
+
+from regexParser import parse_regex, RegexSyntaxError
+from syToSyntaxTree import Nodo
+from compactAST import CompactAST
+from simplifyAST import simplify_ast
+from astToDFA import compact_position_masks, build_dfa_masks
+from AFDtoMinimizedAFD import minimize_dfa
+from simulateDFA import CompiledDFA
+
+DEFAULT_CACHE_SIZE = 256
+
+def _no_stage(name):
+    return nullcontext()
+
+def check_reserved_symbols(regex):
+    """
+    Lanza ValueError si la expresión usa el símbolo reservado '$' (el marcador de fin que
+    agrega add_end_marker). Las entradas que analizan con parse_regex(validate=False), como
+    LazyDFA.from_regex y SearchDFA.from_regex, lo revisan con esta función.
+    """
+    if '$' in regex:
+        raise ValueError("El símbolo '$' está reservado para indicar el final de la cadena.")
+
+def _parse(regex, stats, make):
+    # Analiza la expresión con los mismos errores (y en el mismo orden) que el pipeline por etapas.
+    stage = _no_stage if stats is None else stats.stage
+    with stage("parse_regex"):
+        try:
+            tree = parse_regex(regex, make=make)
+        except RegexSyntaxError as e:
+            if e.stage == "validar_regex":
+                raise RegexSyntaxError(f"La expresión regular no es válida: {regex!r}", e.position, e.stage) from e
+            error = e
+        else:
+            error = None
+        # Igual que en el pipeline por etapas, '$' se revisa después de validar y antes de
+        # reportar los errores de construcción del árbol.
+        check_reserved_symbols(regex)
+        if error is not None:
+            raise error
+        return tree
+
+def parse_regex_tree(regex, stats=None):
+    """
+    Valida la expresión regular y construye su árbol sintáctico (sin el marcador '$') con el
+    analizador de una sola pasada (regexParser.parse_regex).
+    Lanza ValueError si la expresión no es válida o si usa el símbolo reservado '$'; los errores
+    de sintaxis son RegexSyntaxError, que indica además la posición del error.
+    Si se indica stats (pipelineStats.CompileStats), se registra el tiempo de cada etapa.
+    """
+    return _parse(regex, stats, Nodo)
+
+def parse_compact_ast(regex, stats=None, simplify=True):
+    """
+    Igual que parse_regex_tree, pero construye el árbol directamente en un
+    compactAST.CompactAST (sin objetos Nodo) y le agrega el marcador '$' como (R . $).
+    Si simplify es True (por defecto), antes del marcador se aplica simplifyAST.simplify_ast,
+    que elimina posiciones redundantes; con stats se registra cuántas en positions_removed.
+    """
+    ast = CompactAST()
+    _parse(regex, stats, ast.add)
+    if simplify:
+        if stats is None:
+            ast, _ = simplify_ast(ast)
+        else:
+            with stats.stage("simplify_ast"):
+                ast, stats.positions_removed = simplify_ast(ast)
+    ast.add_end_marker()
+    return ast
+
+def build_minimized_dfa(regex, stats=None):
+    """
+    Compila la expresión regular hasta el DFA minimizado.
+    El árbol se construye en forma compacta (parse_compact_ast) y las tablas de posiciones
+    (followpos) y los estados del AFD directo se descartan antes de minimizar.
+    Si se indica stats (pipelineStats.CompileStats), se registran los tiempos por etapa y los
+    contadores de cada una.
+
+    Retorna:
+      - new_initial, new_transitions, new_accepting: igual que minimize_dfa.
+    """
+    ast = parse_compact_ast(regex, stats)
+    if stats is None:
+        transitions, accepting_states, _ = build_dfa_masks(*compact_position_masks(ast))
+        new_initial, new_transitions, new_accepting, _, _ = minimize_dfa(transitions, accepting_states)
+        return new_initial, new_transitions, new_accepting
+
+    with stats.stage("compute_position_masks"):
+        first, pos_dict, followpos = compact_position_masks(ast)
+    stats.record_positions(pos_dict, followpos)
+    with stats.stage("build_dfa_masks"):
+        transitions, accepting_states, state_masks = build_dfa_masks(first, pos_dict, followpos)
+    stats.dfa_states = len(state_masks)
+    del first, pos_dict, followpos, state_masks
+    with stats.stage("minimize_dfa"):
+        new_initial, new_transitions, new_accepting, _, _ = minimize_dfa(
+            transitions, accepting_states, stats=stats)
+    return new_initial, new_transitions, new_accepting
+
+class CompileCache:
+    """
+    Caché LRU acotada expresión regular -> CompiledDFA, segura entre hilos.
+
+    Atributos:
+      - maxsize: número máximo de patrones guardados.
+      - hits, misses, evictions: contadores de aciertos, fallos y desalojos.
+    """
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE):
+        if maxsize < 1:
+            raise ValueError("El tamaño de la caché debe ser al menos 1.")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, regex):
+        """Retorna el CompiledDFA de regex, compilándolo sólo si no está en la caché."""
+        with self._lock:
+            dfa = self._entries.get(regex)
+            if dfa is not None:
+                self._entries.move_to_end(regex)
+                self.hits += 1
+                return dfa
+            self.misses += 1
+        # La compilación se hace fuera del candado; si otro hilo compiló el mismo patrón
+        # mientras tanto, se conserva su instancia para que todos compartan la misma.
+        dfa = CompiledDFA(*build_minimized_dfa(regex))
+        with self._lock:
+            current = self._entries.setdefault(regex, dfa)
+            self._entries.move_to_end(regex)
+            self._trim()
+        return current
+
+    def resize(self, maxsize):
+        """Cambia el tamaño máximo y desaloja las entradas sobrantes."""
+        if maxsize < 1:
+            raise ValueError("El tamaño de la caché debe ser al menos 1.")
+        with self._lock:
+            self.maxsize = maxsize
+            self._trim()
+
+    def clear(self):
+        """Vacía la caché y reinicia los contadores."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self):
+        """Retorna un diccionario con el tamaño actual, el máximo y los contadores."""
+        with self._lock:
+            return {"size": len(self._entries), "maxsize": self.maxsize, "hits": self.hits,
+                    "misses": self.misses, "evictions": self.evictions}
+
+    def _trim(self):
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+_compile_cache = CompileCache()
+
+def compile(regex):
+    """
+    Retorna el CompiledDFA (inmutable y compartido) de la expresión regular.
+    Lanza ValueError si la expresión no es válida; los errores no se guardan en la caché.
+    """
+    return _compile_cache.get(regex)
+
+def set_cache_size(maxsize):
+    """Configura el número máximo de patrones que conserva compile."""
+    _compile_cache.resize(maxsize)
+
+def cache_info():
+    """Retorna el tamaño y los contadores (hits, misses, evictions) de la caché de compile."""
+    return _compile_cache.info()
+
+def clear_cache():
+    """Vacía la caché de compile."""
+    _compile_cache.clear()
@@ -0,0 +1,172 @@
+"""
+Evaluación de corpus grandes (muchos registros) con un CompiledDFA en varios procesos.
+
+Los archivos se dividen en fragmentos (shards) de rangos de bytes alineados a saltos de línea,
+de modo que ningún registro queda partido entre dos fragmentos. Cada proceso del pool recibe
+el DFA una sola vez, en el inicializador, y cada tarea sólo lleva la ruta y el rango de bytes;
+el proceso lee su fragmento con mmap. Los resultados (conteos, índices y desplazamientos de
+los registros aceptados) se combinan en el orden de la entrada.
+
+Los registros se delimitan igual que en simulateDFA.iter_records: por '\n', y se descarta
+un '\r' final ('\r\n').
+"""
+
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from simulateDFA import MatchSummary
+
+DEFAULT_SHARD_SIZE = 16 << 20
+DEFAULT_RECORD_CHUNK = 10000
+
+def shard_ranges(path, shard_size=DEFAULT_SHARD_SIZE):
+    """
+    Divide un archivo en rangos [inicio, fin) de aproximadamente shard_size bytes; cada rango
+    termina justo después de un salto de línea (o en el final del archivo).
+    """
+    size = os.path.getsize(path)
+    ranges = []
+    if size == 0:
+        return ranges
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = 0
+            while start < size:
+                nominal = start + shard_size
+                if nominal >= size:
+                    end = size
+                else:
+                    newline = mm.find(b"\n", nominal - 1)
+                    end = size if newline < 0 else newline + 1
+                ranges.append((start, end))
+                start = end
+    return ranges
+
+def match_buffer(dfa, data, base=0, indices=False, offsets=False, encoding="utf-8"):
+    """
+    Evalúa cada registro de un bloque de bytes que comienza al inicio de un registro.
+
+    Retorna:
+      - (total, accepted, matched_indices, matched_offsets): los índices son relativos al
+        bloque y los desplazamientos absolutos (base + posición en el bloque); las listas son
+        None si no se pidieron.
+    """
+    fullmatch = dfa.fullmatch
+    lines = data.split(b"\n")
+    if not lines[-1]:
+        lines.pop()  # bloque vacío o terminado en salto de línea
+    accepted = 0
+    matched_indices = [] if indices else None
+    matched_offsets = [] if offsets else None
+    pos = base
+    for i, line in enumerate(lines):
+        length = len(line)
+        if line.endswith(b"\r"):
+            line = line[:-1]
+        if fullmatch(line.decode(encoding)):
+            accepted += 1
+            if matched_indices is not None:
+                matched_indices.append(i)
+            if matched_offsets is not None:
+                matched_offsets.append(pos)
+        pos += length + 1
+    return len(lines), accepted, matched_indices, matched_offsets
+
+# Estado de cada proceso del pool: el DFA se envía una sola vez en el inicializador.
+_worker_dfa = None
+_worker_encoding = None
+
+def _init_worker(dfa, encoding):
+    global _worker_dfa, _worker_encoding
+    _worker_dfa = dfa
+    _worker_encoding = encoding
+
+def _match_shard(task, dfa=None, encoding=None):
+    if dfa is None:
+        dfa, encoding = _worker_dfa, _worker_encoding
+    path, start, end, indices, offsets = task
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            data = mm[start:end]
+    return match_buffer(dfa, data, start, indices, offsets, encoding)
+
+def _match_strings(task, dfa=None):
+    strings, indices = task
+    fullmatch = (dfa or _worker_dfa).fullmatch
+    accepted = 0
+    matched = [] if indices else None
+    for i, s in enumerate(strings):
+        if fullmatch(s):
+            accepted += 1
+            if matched is not None:
+                matched.append(i)
+    return len(strings), accepted, matched
+
+def _merge(summary, total, accepted, matched_indices, matched_offsets):
+    # Agrega el resultado de un fragmento a summary; los índices del fragmento se desplazan
+    # por el número de registros anteriores.
+    if summary.indices is not None:
+        summary.indices.extend(summary.total + i for i in matched_indices)
+    if summary.offsets is not None:
+        summary.offsets.extend(matched_offsets)
+    summary.total += total
+    summary.accepted += accepted
+
+def match_corpus(dfa, paths, workers=None, shard_size=DEFAULT_SHARD_SIZE,
+                 indices=False, offsets=False, encoding="utf-8"):
+    """
+    Evalúa cada registro (línea) de uno o varios archivos en un pool de procesos.
+
+    Parámetros:
+      - dfa: CompiledDFA.
+      - paths: ruta o lista de rutas.
+      - workers: número de procesos (por defecto, os.cpu_count()); con 1 no se crea pool.
+      - shard_size: tamaño aproximado en bytes de cada fragmento.
+      - indices / offsets: incluir los números de línea (base 0) y los desplazamientos en bytes
+        de los registros aceptados.
+      - encoding: encoding de los registros.
+
+    Retorna:
+      - Un MatchSummary por archivo (una lista si paths es una lista), igual que match_file.
+    """
+    single = isinstance(paths, (str, bytes, os.PathLike))
+    path_list = [paths] if single else list(paths)
+    summaries = [MatchSummary(0, 0, [] if indices else None, [] if offsets else None)
+                 for _ in path_list]
+    tasks = []
+    owners = []
+    for k, path in enumerate(path_list):
+        for start, end in shard_ranges(path, shard_size):
+            tasks.append((os.fspath(path), start, end, indices, offsets))
+            owners.append(k)
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) <= 1:
+        results = (_match_shard(task, dfa, encoding) for task in tasks)
+        for k, result in zip(owners, results):
+            _merge(summaries[k], *result)
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(dfa, encoding)) as pool:
+            for k, result in zip(owners, pool.map(_match_shard, tasks)):
+                _merge(summaries[k], *result)
+    return summaries[0] if single else summaries
+
+def match_records_parallel(dfa, strings, workers=None, chunk_size=DEFAULT_RECORD_CHUNK, indices=False):
+    """
+    Versión en paralelo de simulateDFA.match_many: reparte una secuencia de cadenas en lotes
+    de chunk_size entre los procesos y combina los resultados en orden.
+    """
+    strings = list(strings)
+    tasks = [(strings[i:i + chunk_size], indices) for i in range(0, len(strings), chunk_size)]
+    summary = MatchSummary(0, 0, [] if indices else None)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) <= 1:
+        results = (_match_strings(task, dfa) for task in tasks)
+        for total, accepted, matched in results:
+            _merge(summary, total, accepted, matched, None)
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(dfa, None)) as pool:
+            for total, accepted, matched in pool.map(_match_strings, tasks):
+                _merge(summary, total, accepted, matched, None)
+    return summary
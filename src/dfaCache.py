@@ -0,0 +1,346 @@
+"""
+Caché persistente en disco de DFA minimizados, indexada por expresión regular.
+
+Cada entrada guarda (new_initial, new_transitions, new_accepting) de una expresión regular
+en un formato binario compacto que se carga mucho más rápido que recompilar.
+
+Formato de archivo (enteros little-endian):
+  - Encabezado: MAGIC (4 bytes), FORMAT_VERSION (u16), reservado (u16), CRC32 del contenido (u32),
+    longitud del contenido (u32).
+  - Contenido: la expresión normalizada, las etiquetas de símbolos, los estados de aceptación
+    y las transiciones como arreglos de u32.
+
+Garantías:
+  - Escritura atómica: el archivo se escribe en un temporal del mismo directorio y se publica
+    con os.replace, de modo que lectores y escritores concurrentes nunca ven archivos a medias.
+  - Entradas obsoletas: si cambia FORMAT_VERSION, si el CRC no coincide o si la expresión
+    guardada no es la pedida, la entrada se descarta y se recompila.
+  - Código generado: junto a cada DFA puede guardarse el código fuente de su función
+    especializada (codegenDFA), validado por la versión del generador.
+  - Tamaño acotado: al superar max_bytes se eliminan las entradas usadas menos recientemente
+    (cada lectura actualiza la fecha de modificación del archivo).
+"""
+
+import hashlib
+import os
+import struct
+import sys
+import tempfile
+import zlib
+from array import array
+
+from compileRegex import build_minimized_dfa
+from regexToSY import tokenize
+from symbolClasses import parse_bracket, ranges_label
+from syToSyntaxTree import EPSILON
+
+MAGIC = b"AFDC"
+# Se incrementa también cuando cambia el lenguaje compilado (2: la hoja '#' es ε, ver
+# syToSyntaxTree.EPSILON; 3: "\#" es el carácter '#'), para descartar los DFA guardados con el
+# significado anterior.
+FORMAT_VERSION = 3
+HEADER = struct.Struct("<4sHHII")
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+EVICT_TARGET = 0.9
+FILE_SUFFIX = ".dfa"
+SOURCE_SUFFIX = ".py"
+CACHE_SUFFIXES = (FILE_SUFFIX, SOURCE_SUFFIX)
+
+def normalize_regex(regex):
+    """
+    Forma normalizada de la expresión, usada como llave: la secuencia de tokens de tokenize
+    con las clases de caracteres reemplazadas por su etiqueta canónica. Así, por ejemplo,
+    "\\a[cb]" y "a[b-c]" comparten entrada. La clase "[#]" no se convierte en literal, porque
+    el literal '#' es ε (syToSyntaxTree.EPSILON).
+    Lanza ValueError si la expresión no se puede tokenizar.
+    """
+    parts = []
+    for kind, value in tokenize(regex):
+        if kind == "BRACKET":
+            value = ranges_label(parse_bracket(value))
+            if len(value) == 1 and value != EPSILON:
+                kind = "LITERAL"
+        parts.append(f"{kind[0]}{len(value)}:{value}")
+    return "".join(parts)
+
+def _u32(values):
+    data = array('I', values)
+    if sys.byteorder == "big":
+        data.byteswap()
+    return data.tobytes()
+
+def _read_u32(payload, offset, count):
+    data = array('I')
+    data.frombytes(payload[offset:offset + 4 * count])
+    if len(data) != count:
+        raise ValueError("Entrada de caché truncada.")
+    if sys.byteorder == "big":
+        data.byteswap()
+    return data, offset + 4 * count
+
+def _encode_text(text):
+    return text.encode("utf-8", "surrogatepass")
+
+def serialize_dfa(key, new_initial, new_transitions, new_accepting):
+    """Codifica un DFA minimizado (y la llave normalizada que lo identifica) en bytes."""
+    states = list(new_transitions.keys())
+    index = {s: i for i, s in enumerate(states)}
+    for s in [new_initial] + [d for trans in new_transitions.values() for d in trans.values()]:
+        if s not in index:
+            index[s] = len(states)
+            states.append(s)
+    labels = sorted({sym for trans in new_transitions.values() for sym in trans})
+    label_index = {label: i for i, label in enumerate(labels)}
+    encoded_labels = [_encode_text(label) for label in labels]
+
+    counts = []
+    pairs = []
+    for s in states:
+        trans = new_transitions.get(s, {})
+        counts.append(len(trans))
+        for sym, dest in trans.items():
+            pairs.append(label_index[sym])
+            pairs.append(index[dest])
+    accepting = sorted(index[s] for s in new_accepting if s in index)
+    encoded_key = _encode_text(key)
+
+    payload = b"".join([
+        _u32([len(encoded_key), len(states), index[new_initial], len(labels), len(accepting), len(pairs)]),
+        encoded_key,
+        _u32(len(b) for b in encoded_labels),
+        b"".join(encoded_labels),
+        _u32(accepting),
+        _u32(counts),
+        _u32(pairs),
+    ])
+    return HEADER.pack(MAGIC, FORMAT_VERSION, 0, zlib.crc32(payload), len(payload)) + payload
+
+def deserialize_dfa(data, expected_key=None):
+    """
+    Decodifica bytes producidos por serialize_dfa.
+
+    Retorna (new_initial, new_transitions, new_accepting); lanza ValueError si los datos
+    están corruptos, son de otra versión o (si se indica expected_key) de otra expresión.
+    """
+    if len(data) < HEADER.size:
+        raise ValueError("Entrada de caché truncada.")
+    magic, version, _, crc, length = HEADER.unpack_from(data)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError("Entrada de caché de otro formato o versión.")
+    payload = memoryview(data)[HEADER.size:]
+    if len(payload) != length or zlib.crc32(payload) != crc:
+        raise ValueError("Entrada de caché corrupta.")
+
+    (key_len, n_states, initial, n_labels, n_accepting, n_pairs), offset = _read_u32(payload, 0, 6)
+    key = bytes(payload[offset:offset + key_len]).decode("utf-8", "surrogatepass")
+    offset += key_len
+    if expected_key is not None and key != expected_key:
+        raise ValueError("La entrada de caché corresponde a otra expresión.")
+    label_lengths, offset = _read_u32(payload, offset, n_labels)
+    labels = []
+    for n in label_lengths:
+        labels.append(bytes(payload[offset:offset + n]).decode("utf-8", "surrogatepass"))
+        offset += n
+    accepting, offset = _read_u32(payload, offset, n_accepting)
+    counts, offset = _read_u32(payload, offset, n_states)
+    pairs, offset = _read_u32(payload, offset, n_pairs)
+
+    new_transitions = {}
+    k = 0
+    for s in range(n_states):
+        trans = new_transitions[s] = {}
+        for _ in range(counts[s]):
+            trans[labels[pairs[k]]] = pairs[k + 1]
+            k += 2
+    return initial, new_transitions, set(accepting)
+
+class DiskCache:
+    """
+    Caché de DFA minimizados en un directorio.
+
+    Parámetros:
+      - directory: directorio de la caché (se crea si no existe).
+      - max_bytes: tamaño total máximo de las entradas; al superarlo se desalojan las
+        usadas menos recientemente.
+
+    El directorio se recorre una sola vez al crear la caché; después el tamaño total se lleva
+    en memoria al escribir y eliminar entradas, y sólo se vuelve a recorrer (en evict) cuando
+    ese total supera max_bytes. evict deja la caché en EVICT_TARGET * max_bytes, de modo que
+    una caché llena no se recorre en cada escritura.
+
+    Atributos:
+      - hits, misses, stale: lecturas encontradas, no encontradas y descartadas por obsoletas.
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = os.fspath(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        os.makedirs(self.directory, exist_ok=True)
+        self._sizes = {}    # ruta -> tamaño de las entradas conocidas
+        self._total = 0
+        self._scan()
+
+    def path_for(self, key, suffix=FILE_SUFFIX):
+        """Ruta del archivo de la entrada con llave normalizada key."""
+        digest = hashlib.sha256(f"{FORMAT_VERSION}\0{key}".encode("utf-8", "surrogatepass")).hexdigest()
+        return os.path.join(self.directory, digest + suffix)
+
+    def load(self, regex):
+        """Retorna (new_initial, new_transitions, new_accepting) desde la caché, o None."""
+        entry = self._load(regex)
+        return entry and entry[1]
+
+    def load_serialized(self, regex):
+        """Retorna los bytes (ya validados) de la entrada de regex, o None."""
+        entry = self._load(regex)
+        return entry and entry[0]
+
+    def _load(self, regex):
+        # Retorna (bytes, dfa) de la entrada, o None si no existe o es obsoleta.
+        key = normalize_regex(regex)
+        path = self.path_for(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        try:
+            dfa = deserialize_dfa(data, key)
+        except (ValueError, struct.error, UnicodeDecodeError):
+            self.stale += 1
+            self.misses += 1
+            self._discard(path)
+            return None
+        self.hits += 1
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data, dfa
+
+    def store(self, regex, new_initial, new_transitions, new_accepting):
+        """Guarda el DFA minimizado de regex de forma atómica y aplica el límite de tamaño."""
+        key = normalize_regex(regex)
+        self.store_serialized(key, serialize_dfa(key, new_initial, new_transitions, new_accepting))
+
+    def store_serialized(self, key, data):
+        """Guarda bytes ya producidos por serialize_dfa con la llave normalizada key."""
+        self._write(self.path_for(key), data)
+
+    def load_source(self, regex, version):
+        """
+        Retorna el código fuente generado (codegenDFA) guardado junto al DFA de regex, o None
+        si no existe o corresponde a otra versión del generador.
+        """
+        key = normalize_regex(regex)
+        path = self.path_for(key, SOURCE_SUFFIX)
+        try:
+            with open(path, "r", encoding="utf-8", errors="surrogatepass") as f:
+                header = f.readline()
+                source = f.read()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, UnicodeDecodeError):
+            source = header = None
+        if header != self._source_header(key, version):
+            self.stale += 1
+            self.misses += 1
+            self._discard(path)
+            return None
+        self.hits += 1
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return source
+
+    def store_source(self, regex, version, source):
+        """Guarda de forma atómica el código fuente generado para regex."""
+        key = normalize_regex(regex)
+        data = (self._source_header(key, version) + source).encode("utf-8", "surrogatepass")
+        self._write(self.path_for(key, SOURCE_SUFFIX), data)
+
+    @staticmethod
+    def _source_header(key, version):
+        return f"# {FORMAT_VERSION} {version} {key!r}\n"
+
+    def _write(self, path, data):
+        # Escritura atómica: archivo temporal en el mismo directorio y os.replace.
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            self._remove(tmp_path)
+            raise
+        self._total += len(data) - self._sizes.get(path, 0)
+        self._sizes[path] = len(data)
+        if self._total > self.max_bytes:
+            self.evict()
+
+    def get_or_compile(self, regex):
+        """Carga el DFA de la caché o lo compila con build_minimized_dfa y lo guarda."""
+        dfa = self.load(regex)
+        if dfa is None:
+            dfa = build_minimized_dfa(regex)
+            self.store(regex, *dfa)
+        return dfa
+
+    def evict(self):
+        """
+        Elimina las entradas menos recientemente usadas. Si el directorio supera max_bytes,
+        quedan a lo más EVICT_TARGET * max_bytes.
+        """
+        entries = self._scan()
+        if self._total <= self.max_bytes:
+            return
+        target = self.max_bytes * EVICT_TARGET
+        entries.sort()
+        for _, size, path in entries:
+            if self._total <= target:
+                break
+            self._discard(path)
+
+    def clear(self):
+        """Elimina todas las entradas de la caché."""
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(CACHE_SUFFIXES):
+                    self._remove(entry.path)
+        self._sizes.clear()
+        self._total = 0
+
+    def _scan(self):
+        # Recorre el directorio, actualiza el tamaño total conocido (también cuenta las
+        # entradas escritas por otros procesos) y retorna [(mtime, tamaño, ruta)].
+        entries = []
+        sizes = {}
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(CACHE_SUFFIXES):
+                    try:
+                        st = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+                    sizes[entry.path] = st.st_size
+        self._sizes = sizes
+        self._total = sum(sizes.values())
+        return entries
+
+    def _discard(self, path):
+        self._remove(path)
+        self._total -= self._sizes.pop(path, 0)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,154 @@
+"""
+Exportación de AFD grandes a DOT o JSON sin depender de graphviz.
+
+A diferencia de graphAFD / graphMinimizedAFD, que construyen el grafo completo en memoria y
+lo renderizan con dot de forma síncrona, aquí el archivo se escribe estado por estado:
+  - Las aristas paralelas (mismo origen y destino) se unen en una sola con la etiqueta de
+    la unión de sus rangos; por ejemplo, 26 aristas 'a', 'b', ..., 'z' quedan como "[a-z]".
+  - Las etiquetas (de aristas y de estados) se truncan a max_label caracteres.
+  - Opcionalmente se exporta sólo la vecindad a k saltos (en ambos sentidos) de ciertos estados.
+
+El formato de entrada es el de minimize_dfa: (new_initial, new_transitions, new_accepting).
+Para el AFD directo (estados como frozensets) se puede usar flatten_direct_dfa.
+El archivo DOT resultante puede renderizarse después con dot (por ejemplo, dot -Tsvg).
+"""
+
+import json
+from collections import deque
+
+from symbolClasses import label_ranges, normalize_ranges, ranges_label
+
+DEFAULT_MAX_LABEL = 32
+ELLIPSIS = "…"
+
+def truncate_label(label, max_label=DEFAULT_MAX_LABEL):
+    """Recorta label a max_label caracteres (None = sin límite), terminando en '…'."""
+    if max_label is None or len(label) <= max_label:
+        return label
+    return label[:max(max_label - 1, 0)] + ELLIPSIS
+
+def merge_edges(trans):
+    """
+    Une las transiciones de un estado por destino.
+    Retorna una lista [(destino, etiqueta)] donde la etiqueta describe la unión de los rangos
+    de todas las etiquetas que llevan a ese destino.
+    """
+    by_dest = {}
+    for sym, dest in trans.items():
+        by_dest.setdefault(dest, []).extend(label_ranges(sym))
+    return [(dest, ranges_label(normalize_ranges(ranges))) for dest, ranges in by_dest.items()]
+
+def neighbourhood(new_transitions, focus, hops):
+    """Retorna el conjunto de estados a lo sumo a hops saltos (en cualquier sentido) de focus."""
+    adjacent = {}
+    for s, trans in new_transitions.items():
+        for dest in trans.values():
+            adjacent.setdefault(s, set()).add(dest)
+            adjacent.setdefault(dest, set()).add(s)
+    selected = set(focus)
+    frontier = deque((s, 0) for s in selected)
+    while frontier:
+        s, distance = frontier.popleft()
+        if distance == hops:
+            continue
+        for t in adjacent.get(s, ()):
+            if t not in selected:
+                selected.add(t)
+                frontier.append((t, distance + 1))
+    return selected
+
+def flatten_direct_dfa(dfa_states, transitions):
+    """
+    Convierte el AFD directo de direct_dfa_from_ast (estados como frozensets) al formato por
+    números. Retorna (transiciones por id, etiquetas de estado con las posiciones).
+    """
+    id_transitions = {dfa_states[s]: {sym: dfa_states[d] for sym, d in trans.items()}
+                      for s, trans in transitions.items()}
+    state_labels = {state_id: str(sorted(state)) for state, state_id in dfa_states.items()}
+    return id_transitions, state_labels
+
+def _states_to_export(new_initial, new_transitions, new_accepting, focus, hops):
+    states = dict.fromkeys(new_transitions)
+    for s in [new_initial, *new_accepting]:
+        states.setdefault(s)
+    if focus is not None:
+        selected = neighbourhood(new_transitions, focus, hops)
+        return [s for s in states if s in selected], selected
+    return list(states), None
+
+def _dot_string(text):
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+
+def _open_output(output):
+    if hasattr(output, "write"):
+        return output, False
+    return open(output, "w", encoding="utf-8"), True
+
+def write_dot(output, new_initial, new_transitions, new_accepting, max_label=DEFAULT_MAX_LABEL,
+              focus=None, hops=1, state_labels=None, name="AFD"):
+    """
+    Escribe el AFD en formato DOT.
+
+    Parámetros:
+      - output: ruta o archivo de texto abierto.
+      - max_label: longitud máxima de las etiquetas (None = sin límite).
+      - focus, hops: si se indica focus (estados), sólo se exporta su vecindad a hops saltos.
+      - state_labels: diccionario opcional estado -> texto adicional del nodo.
+    """
+    states, selected = _states_to_export(new_initial, new_transitions, new_accepting, focus, hops)
+    out, close = _open_output(output)
+    try:
+        out.write(f"digraph {_dot_string(name)} {{\n")
+        out.write("  rankdir=LR;\n  node [shape=circle];\n")
+        if selected is None or new_initial in selected:
+            out.write('  start [label="", shape=none];\n')
+            out.write(f"  start -> {_dot_string(str(new_initial))};\n")
+        for s in states:
+            label = f"q{s}"
+            if state_labels is not None and s in state_labels:
+                label += "\n" + truncate_label(state_labels[s], max_label)
+            shape = ' shape=doublecircle' if s in new_accepting else ''
+            out.write(f"  {_dot_string(str(s))} [label={_dot_string(label)}{shape}];\n")
+        for s in states:
+            for dest, label in merge_edges(new_transitions.get(s, {})):
+                if selected is not None and dest not in selected:
+                    continue
+                out.write(f"  {_dot_string(str(s))} -> {_dot_string(str(dest))}"
+                          f" [label={_dot_string(truncate_label(label, max_label))}];\n")
+        out.write("}\n")
+    finally:
+        if close:
+            out.close()
+
+def write_json(output, new_initial, new_transitions, new_accepting, max_label=DEFAULT_MAX_LABEL,
+               focus=None, hops=1, state_labels=None):
+    """
+    Escribe el AFD como un grafo JSON compacto:
+      {"initial": q0, "accepting": [...], "nodes": [{"id": q, "label": ...}, ...],
+       "edges": [[origen, destino, etiqueta], ...]}
+    Los parámetros son los mismos que en write_dot.
+    """
+    states, selected = _states_to_export(new_initial, new_transitions, new_accepting, focus, hops)
+    out, close = _open_output(output)
+    dumps = json.dumps
+    try:
+        accepting = [s for s in states if s in new_accepting]
+        out.write(f'{{"initial":{dumps(new_initial)},"accepting":{dumps(accepting)},"nodes":[')
+        for k, s in enumerate(states):
+            node = {"id": s}
+            if state_labels is not None and s in state_labels:
+                node["label"] = truncate_label(state_labels[s], max_label)
+            out.write(("," if k else "") + dumps(node, ensure_ascii=False, separators=(",", ":")))
+        out.write('],"edges":[')
+        first = True
+        for s in states:
+            for dest, label in merge_edges(new_transitions.get(s, {})):
+                if selected is not None and dest not in selected:
+                    continue
+                edge = [s, dest, truncate_label(label, max_label)]
+                out.write(("" if first else ",") + dumps(edge, ensure_ascii=False, separators=(",", ":")))
+                first = False
+        out.write("]}\n")
+    finally:
+        if close:
+            out.close()
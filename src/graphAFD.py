@@ -1,4 +1,3 @@
-from graphviz import Digraph
 import os
 import platform
 
@@ -14,6 +13,8 @@ def graph_dfa(dfa_states, transitions, accepting_states):
 
     Se asume que el estado inicial es el que tiene id 0.
     """
+    from graphviz import Digraph
+
     dot = Digraph(comment="DFA")
     
     # Determinar el estado inicial: buscamos el estado cuya asignación sea 0.
@@ -5,14 +5,16 @@ Se espera que se le suministren:
   - new_transitions: diccionario con la forma { state_id: { símbolo: state_id_destino, ... }, ... }
   - new_accepting: conjunto de estados finales (números)
   - new_initial: estado inicial (número)
-El diagrama se guardará (por ejemplo, como "graphMinimizedAFD.png") y se abrirá automáticamente.
+El diagrama se guardará (por ejemplo, como "graphMinimizedAFD.png") y se abrirá automáticamente,
+salvo que se indique open_image=False. graphviz se importa sólo al graficar.
 """
 
-from graphviz import Digraph
 import os
 import platform
 
-def graph_minimized_dfa(new_initial, new_transitions, new_accepting):
+def graph_minimized_dfa(new_initial, new_transitions, new_accepting, filename="graphMinimizedAFD", open_image=True):
+    from graphviz import Digraph
+
     dot = Digraph(comment="DFA Minimizado")
     
     # Crear un nodo invisible para la flecha de inicio.
@@ -31,7 +33,9 @@ def graph_minimized_dfa(new_initial, new_transitions, new_accepting):
             dot.edge(str(state), str(dest), label=symbol)
     
     # Renderizar y guardar la imagen (por defecto graphMinimizedAFD.png)
-    output_path = dot.render("graphMinimizedAFD", format="png", cleanup=True)
+    output_path = dot.render(filename, format="png", cleanup=True)
+    if not open_image:
+        return dot
     try:
         if platform.system() == "Darwin":       # macOS
             os.system(f"open {output_path}")
@@ -0,0 +1,178 @@
+"""
+Construcción perezosa (bajo demanda) del AFD a partir del árbol sintáctico.
+
+En lugar de construir todos los estados alcanzables antes de leer la entrada (build_dfa),
+LazyDFA parte de firstpos de la raíz y de la tabla followpos (motor de bitsets de astToDFA)
+y sólo determiniza las transiciones que efectivamente se recorren al simular.
+
+Los estados materializados viven en una caché acotada (max_states):
+  - Política de desalojo: cuando la caché está llena y hace falta un estado nuevo, se vacía
+    por completo (se conservan sólo el estado inicial y el estado nuevo) y se reconstruye a
+    medida que la simulación lo necesita.
+  - Si la caché se vacía con demasiada frecuencia (menos de min_progress caracteres por
+    estado desde el vaciado anterior), se considera que hay thrashing y el resto de esa
+    entrada se simula directamente sobre conjuntos de posiciones, sin materializar estados.
+
+Así la memoria queda acotada por patrón y una expresión patológica como
+(a|b)*a(a|b)(a|b)... no bloquea la etapa de compilación.
+"""
+
+from astToDFA import compute_position_masks, position_classes, iter_bits, mask_key, window_mask
+from regexParser import parse_regex
+from compileRegex import check_reserved_symbols
+from syToSyntaxTree import add_end_marker, strip_end_marker
+from symbolClasses import SymbolClassMap, label_ranges
+
+DEFAULT_MAX_STATES = 4096
+DEFAULT_MIN_PROGRESS = 10
+
+# Valores especiales en las filas de transiciones.
+UNKNOWN = -2
+DEAD = -1
+
+class LazyDFA:
+    """
+    AFD determinizado bajo demanda con caché de estados acotada.
+
+    Parámetros:
+      - tree: árbol de postfix_a_arbol_sintactico, con o sin el marcador final '$'.
+      - max_states: número máximo de estados materializados a la vez.
+      - min_progress: caracteres por estado por debajo de los cuales un vaciado de la caché
+        se considera thrashing.
+
+    Atributos (estadísticas acumuladas):
+      - states_built: estados materializados en total (incluidos los reconstruidos).
+      - cache_flushes: veces que se vació la caché.
+      - fallbacks: entradas que terminaron de simularse sobre conjuntos de posiciones.
+    """
+    __slots__ = ("max_states", "min_progress", "states_built", "cache_flushes", "fallbacks",
+                 "_first", "_followpos", "_class_masks", "_marker_mask", "_char_class", "_n_classes",
+                 "_ids", "_masks", "_rows", "_accepting", "_initial")
+
+    def __init__(self, tree, max_states=DEFAULT_MAX_STATES, min_progress=DEFAULT_MIN_PROGRESS):
+        if max_states < 2:
+            raise ValueError("max_states debe ser al menos 2.")
+        self.max_states = max_states
+        self.min_progress = min_progress
+        self.states_built = 0
+        self.cache_flushes = 0
+        self.fallbacks = 0
+
+        first, pos_dict, follow_windows = compute_position_masks(add_end_marker(strip_end_marker(tree)))
+        # La simulación combina los estados con las máscaras de clase: se usan máscaras completas.
+        first_mask = window_mask(first)
+        followpos = [window_mask(window) for window in follow_windows]
+        class_labels, classes_of_pos = position_classes(pos_dict)
+        # Las clases se numeran desde 1; la clase 0 son los caracteres fuera del alfabeto.
+        n_classes = len(class_labels) + 1
+        class_masks = [0] * n_classes
+        for p, classes in classes_of_pos.items():
+            for cls in classes:
+                class_masks[cls + 1] |= 1 << p
+        marker_mask = 0
+        for p, symbol in pos_dict.items():
+            if symbol == '$':
+                marker_mask |= 1 << p
+
+        self._first = first_mask
+        self._followpos = followpos
+        self._class_masks = class_masks
+        self._marker_mask = marker_mask
+        self._n_classes = n_classes
+        self._char_class = SymbolClassMap(((label_ranges(label), cls + 1) for cls, label in enumerate(class_labels)),
+                                          missing=0, prefill=map(chr, range(256)))
+        self._ids = {}
+        self._masks = []
+        self._rows = []
+        self._accepting = []
+        self._initial = self._add_state(first_mask)
+
+    @classmethod
+    def from_regex(cls, regex, max_states=DEFAULT_MAX_STATES, min_progress=DEFAULT_MIN_PROGRESS):
+        """
+        Construye el AFD perezoso directamente desde la expresión regular (sin el '$').
+        Lanza ValueError si la expresión usa el símbolo reservado '$'.
+        """
+        check_reserved_symbols(regex)
+        return cls(parse_regex(regex, validate=False), max_states, min_progress)
+
+    @property
+    def cache_size(self):
+        """Número de estados materializados actualmente en la caché."""
+        return len(self._masks)
+
+    def _add_state(self, mask):
+        state_id = len(self._masks)
+        self._ids[mask_key(mask)] = state_id
+        self._masks.append(mask)
+        row = [UNKNOWN] * self._n_classes
+        row[0] = DEAD
+        self._rows.append(row)
+        self._accepting.append(bool(mask & self._marker_mask))
+        self.states_built += 1
+        return state_id
+
+    def _flush(self):
+        # Las listas se vacían en el lugar para que las referencias locales sigan siendo válidas.
+        self._ids.clear()
+        self._masks.clear()
+        self._rows.clear()
+        self._accepting.clear()
+        self.cache_flushes += 1
+        self._initial = self._add_state(self._first)
+
+    def _successor_mask(self, mask, cls):
+        follow = self._followpos
+        result = 0
+        for p in iter_bits(mask & self._class_masks[cls]):
+            result |= follow[p]
+        return result
+
+    def _compute(self, state_id, cls):
+        # Determiniza la transición (state_id, cls). Retorna (id destino, hubo vaciado).
+        mask = self._successor_mask(self._masks[state_id], cls)
+        if not mask:
+            self._rows[state_id][cls] = DEAD
+            return DEAD, False
+        new_id = self._ids.get(mask_key(mask))
+        if new_id is not None:
+            self._rows[state_id][cls] = new_id
+            return new_id, False
+        if len(self._masks) >= self.max_states:
+            self._flush()
+            return self._add_state(mask), True
+        new_id = self._add_state(mask)
+        self._rows[state_id][cls] = new_id
+        return new_id, False
+
+    def _simulate_masks(self, mask, input_string, start):
+        # Simulación sin caché sobre conjuntos de posiciones (respaldo ante thrashing).
+        classes = self._char_class
+        for symbol in input_string[start:]:
+            mask = self._successor_mask(mask, classes[symbol])
+            if not mask:
+                return False
+        return bool(mask & self._marker_mask)
+
+    def fullmatch(self, input_string):
+        """Retorna True si la cadena completa pertenece al lenguaje."""
+        classes = self._char_class
+        rows = self._rows
+        state = self._initial
+        last_flush = 0
+        for i, symbol in enumerate(input_string):
+            cls = classes[symbol]
+            next_state = rows[state][cls]
+            if next_state < 0:
+                if next_state == DEAD:
+                    return False
+                next_state, flushed = self._compute(state, cls)
+                if next_state == DEAD:
+                    return False
+                if flushed:
+                    if i - last_flush < self.min_progress * self.max_states:
+                        self.fallbacks += 1
+                        return self._simulate_masks(self._masks[next_state], input_string, i + 1)
+                    last_flush = i
+            state = next_state
+        return self._accepting[state]
@@ -0,0 +1,188 @@
+"""
+Generador de analizadores léxicos (lexers) sobre la construcción directa del AFD.
+
+Las reglas son una lista ordenada de (nombre_de_token, expresión_regular). Todas se compilan
+en un único AFD (igual que multiDFA) cuyos estados de aceptación se etiquetan con la regla de
+mayor prioridad que aceptan: la primera de la lista. minimize_dfa parte de una partición por
+esa regla, así que el AFD mínimo conserva la prioridad.
+
+La tokenización usa la semántica de coincidencia más larga (maximal munch): desde el inicio
+de cada token se avanza en el AFD recordando el último estado de aceptación, y al llegar al
+estado muerto (o al fin de la entrada) se emite el token hasta esa última aceptación y se
+retrocede sólo hasta ella. Los pares (estado, posición) recorridos después de la última
+aceptación se recuerdan como fallidos y cortan los recorridos siguientes, así que cada par se
+recorre a lo más una vez y el tiempo es lineal en la entrada (para un AFD fijo) aunque las
+reglas obliguen a retroceder repetidamente.
+
+La entrada puede llegar en bloques (chunks) y los tokens se producen con un generador, por
+lo que sólo se conserva en memoria el texto desde el inicio del token en curso, como lista de
+bloques (no se vuelve a copiar al llegar cada bloque).
+"""
+
+import codecs
+from bisect import bisect_right
+from collections import namedtuple
+from itertools import chain
+
+from astToDFA import direct_dfa_bitset
+from AFDtoMinimizedAFD import minimize_dfa
+from simulateDFA import CompiledDFA
+from syToSyntaxTree import add_end_marker
+from compileRegex import parse_regex_tree
+from multiDFA import balanced_union, state_tags
+from streamDFA import DEFAULT_CHUNK_SIZE, iter_chunks
+
+Token = namedtuple("Token", ["kind", "text", "start", "end"])
+Token.__doc__ = "Token reconocido: nombre de la regla, texto y desplazamientos [start, end) en la entrada."
+
+class Lexer:
+    """
+    Analizador léxico compilado a partir de reglas (nombre, expresión_regular) en orden de prioridad.
+
+    Atributos:
+      - names: tupla con los nombres de las reglas (el id de una regla es su posición).
+      - dfa: CompiledDFA del AFD combinado y minimizado.
+      - rule_of: diccionario fila de aceptación -> id de la regla que gana en ese estado.
+    """
+    __slots__ = ("names", "dfa", "rule_of")
+
+    def __init__(self, rules):
+        rules = list(rules)
+        self.names = tuple(name for name, _ in rules)
+        trees = [add_end_marker(parse_regex_tree(regex)) for _, regex in rules]
+        transitions, accepting_states, state_masks, pos_dict, _ = direct_dfa_bitset(balanced_union(trees))
+        # La regla de un estado es la de menor id (mayor prioridad) entre las que acepta.
+        rule_tags = {s: min(tag) for s, tag in state_tags(state_masks, pos_dict).items()}
+        new_initial, new_transitions, new_accepting, state_to_block, _ = minimize_dfa(
+            transitions, accepting_states, rule_tags)
+        self.dfa = CompiledDFA(new_initial, new_transitions, new_accepting)
+        block_rule = {state_to_block[s]: rule for s, rule in rule_tags.items()}
+        self.rule_of = {row: block_rule[self.dfa.state_of(row)] for row in self.dfa.accepting}
+
+    def tokenize(self, text):
+        """Produce los tokens (Token) de una cadena completa."""
+        return self.tokenize_stream((text,))
+
+    def tokenize_stream(self, chunks):
+        """
+        Produce los tokens (Token) de una entrada dividida en bloques de texto (str).
+        Los desplazamientos son relativos al inicio de la entrada completa.
+        Lanza ValueError si en alguna posición ningún token no vacío coincide.
+        """
+        table = self.dfa.table
+        classes = self.dfa.char_class
+        initial = self.dfa.initial
+        rule_of = self.rule_of
+        names = self.names
+
+        # Bloques pendientes (desde el que contiene el inicio del token en curso) y la posición
+        # en la entrada de su primer carácter; el texto no se copia hasta emitir un token.
+        pieces = []
+        offsets = []
+        received = 0
+        start = 0       # inicio del token en curso
+        pos = 0         # siguiente carácter por leer
+        k = 0           # bloque de pieces que contiene pos
+        state = initial
+        last_rule = -1
+        last_end = start
+        last_state = initial
+        # Pares (estado, posición) desde los que ya se sabe que no se llega a otra aceptación.
+        # Al retroceder se agregan los pares recorridos después de la última aceptación, y un
+        # recorrido que llega a uno se corta como en el estado muerto: cada par se recorre a lo
+        # más una vez y la tokenización es lineal aunque las reglas obliguen a retroceder.
+        failed = set()
+        failed_limit = 0
+
+        def between(frm, to):
+            # Texto de la entrada en [frm, to) a partir de los bloques pendientes.
+            if frm >= offsets[-1]:
+                return pieces[-1][frm - offsets[-1]:to - offsets[-1]]
+            k = bisect_right(offsets, frm) - 1
+            parts = []
+            while frm < to:
+                off = offsets[k]
+                stop = min(len(pieces[k]), to - off)
+                parts.append(pieces[k][frm - off:stop])
+                frm = off + stop
+                k += 1
+            return "".join(parts)
+
+        for chunk in chain(chunks, (None,)):
+            final = chunk is None
+            if not final:
+                if not chunk:
+                    continue
+                pieces.append(chunk)
+                offsets.append(received)
+                received += len(chunk)
+            while True:
+                if state and pos < received:
+                    while True:
+                        text = pieces[k]
+                        off = offsets[k]
+                        j = pos - off
+                        n = len(text)
+                        while j < n:
+                            state = table[state + classes[text[j]]]
+                            j += 1
+                            if not state:
+                                break
+                            if failed and (state, off + j) in failed:
+                                state = 0
+                                break
+                            rule = rule_of.get(state)
+                            if rule is not None:
+                                last_rule = rule
+                                last_end = off + j
+                                last_state = state
+                        pos = off + j
+                        if not state or k + 1 == len(pieces):
+                            break
+                        k += 1
+                if state and not final:
+                    break  # el token podría continuar en el siguiente bloque
+                if start == received:
+                    break
+                if last_end == start:
+                    raise ValueError(f"Ningún token coincide en la posición {start}: {between(start, start + 1)!r}")
+                yield Token(names[last_rule], between(start, last_end), start, last_end)
+                # Retroceso: ningún par recorrido después de last_end lleva a una aceptación. Si
+                # el recorrido terminó en el estado muerto (o en un par fallido), el último
+                # carácter leído no agrega pares.
+                replay_end = pos if state else pos - 1
+                if replay_end > last_end:
+                    replay = last_state
+                    p = last_end
+                    for c in between(last_end, replay_end):
+                        replay = table[replay + classes[c]]
+                        p += 1
+                        if not replay:
+                            break
+                        failed.add((replay, p))
+                    failed_limit = max(failed_limit, pos)
+                start = pos = last_end
+                state = initial
+                last_rule = -1
+                if failed and start >= failed_limit:
+                    failed.clear()
+                while offsets[k] > pos:
+                    k -= 1
+                if k:
+                    # Los bloques anteriores al inicio del token ya no se necesitan.
+                    del pieces[:k]
+                    del offsets[:k]
+                    k = 0
+
+    def tokenize_file(self, source, encoding="utf-8", chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Produce los tokens de un archivo (ruta o flujo binario) leído por bloques y decodificado
+        de forma incremental. Los desplazamientos se cuentan en caracteres.
+        """
+        decoder = codecs.getincrementaldecoder(encoding)()
+        texts = (decoder.decode(chunk) for chunk in iter_chunks(source, chunk_size))
+        return self.tokenize_stream(chain(texts, (decoder.decode(b"", final=True),)))
+
+def compile_lexer(rules):
+    """Compila una lista ordenada de reglas (nombre_de_token, expresión_regular) en un Lexer."""
+    return Lexer(rules)
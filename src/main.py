@@ -20,9 +20,9 @@ def main():
         print("Error: El símbolo '$' está reservado para indicar el final de la cadena.")
         return
     
-    # Agregar el símbolo de fin de cadena '$' al final de la expresión
-    if not regex_entrada.endswith('$'):
-        regex_entrada += '$'
+    # Agregar el símbolo de fin de cadena '$' al final de la expresión. Se agrupa la expresión
+    # para que el marcador aplique a todas sus alternativas (por ejemplo, "ab|b" -> "(ab|b)$").
+    regex_entrada = '(' + regex_entrada + ')$' if regex_entrada else '$'
 
     # Conversión de infix a postfix (el proceso tokeniza, inserta concatenaciones y aplica Shunting Yard)
     try:
@@ -108,7 +108,7 @@ def main():
 
     # Procesar cadenas: permitir al usuario ingresar cadenas y mostrar si son aceptadas
     print("\n--- SIMULACIÓN DEL DFA MINIMIZADO ---")
-    process_input(new_transitions, new_initial, new_accepting)
+    process_input(new_transitions, new_initial, new_accepting, debug=True)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,93 @@
+"""
+Compilación de varios patrones en un único AFD etiquetado.
+
+Cada patrón R_i recibe su propio marcador de fin '$' y los árboles (R_i . $) se unen con '|'
+en un árbol balanceado. En el AFD directo, un estado de aceptación contiene uno o más
+marcadores; la etiqueta del estado es el conjunto de ids de patrón de esos marcadores.
+minimize_dfa parte de una partición por etiqueta (tags), de modo que dos estados que aceptan
+conjuntos distintos de patrones nunca se fusionan.
+
+Con una sola pasada sobre la entrada se obtienen todos los patrones que la aceptan.
+"""
+
+from syToSyntaxTree import add_end_marker, balanced_tree
+from astToDFA import direct_dfa_bitset, iter_window
+from AFDtoMinimizedAFD import minimize_dfa
+from simulateDFA import CompiledDFA
+from compileRegex import parse_regex_tree
+
+EMPTY_TAG = frozenset()
+
+def balanced_union(trees):
+    """Une una lista no vacía de árboles con '|' en un árbol balanceado (profundidad logarítmica)."""
+    if not trees:
+        raise ValueError("Se necesita al menos un patrón.")
+    return balanced_tree('|', trees)
+
+def state_tags(state_masks, pos_dict):
+    """
+    Calcula la etiqueta de cada estado del AFD directo multipatrón.
+
+    Los marcadores '$' se numeran en el orden de sus posiciones: como las hojas se numeran
+    de izquierda a derecha y balanced_union conserva el orden de los patrones, el k-ésimo
+    marcador pertenece al patrón k.
+
+    Retorna:
+      - tags: diccionario id de estado -> frozenset de ids de patrón (sólo estados de aceptación).
+    """
+    marker_tag = {}
+    for p in sorted(pos_dict):
+        if pos_dict[p] == '$':
+            marker_tag[p] = len(marker_tag)
+    tags = {}
+    for state_id, window in enumerate(state_masks):
+        markers = [marker_tag[p] for p in iter_window(window) if p in marker_tag]
+        if markers:
+            tags[state_id] = frozenset(markers)
+    return tags
+
+class MultiDFA:
+    """
+    AFD etiquetado para un conjunto de patrones.
+
+    Atributos:
+      - patterns: tupla con las expresiones regulares, en el orden de sus ids.
+      - dfa: CompiledDFA del AFD minimizado combinado.
+      - tags: diccionario fila de la tabla -> frozenset de ids de patrón que aceptan en ese estado.
+    """
+    __slots__ = ("patterns", "dfa", "tags")
+
+    def __init__(self, patterns):
+        self.patterns = tuple(patterns)
+        trees = [add_end_marker(parse_regex_tree(regex)) for regex in self.patterns]
+        transitions, accepting_states, state_masks, pos_dict, _ = direct_dfa_bitset(balanced_union(trees))
+        tags = state_tags(state_masks, pos_dict)
+        new_initial, new_transitions, new_accepting, state_to_block, _ = minimize_dfa(
+            transitions, accepting_states, tags)
+        self.dfa = CompiledDFA(new_initial, new_transitions, new_accepting)
+        block_tags = {state_to_block[s]: tag for s, tag in tags.items()}
+        self.tags = {row: block_tags[self.dfa.state_of(row)] for row in self.dfa.accepting}
+
+    def match(self, input_string):
+        """Retorna el frozenset de ids de los patrones que aceptan la cadena completa."""
+        table = self.dfa.table
+        classes = self.dfa.char_class
+        state = self.dfa.initial
+        for symbol in input_string:
+            state = table[state + classes[symbol]]
+            if not state:
+                return EMPTY_TAG
+        return self.tags.get(state, EMPTY_TAG)
+
+    def matching_patterns(self, input_string):
+        """Retorna la lista de expresiones regulares que aceptan la cadena, en orden de id."""
+        return [self.patterns[i] for i in sorted(self.match(input_string))]
+
+    def iter_match(self, strings):
+        """Produce, para cada cadena de strings, el frozenset de ids de patrón que la aceptan."""
+        for s in strings:
+            yield self.match(s)
+
+def compile_patterns(patterns):
+    """Compila una lista de expresiones regulares en un MultiDFA (ids = posición en la lista)."""
+    return MultiDFA(patterns)
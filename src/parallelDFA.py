@@ -0,0 +1,151 @@
+"""
+Simulación especulativa en paralelo de un CompiledDFA sobre una sola entrada muy grande.
+
+La entrada se divide en bloques contiguos. Para cada bloque, un proceso calcula la función
+estado -> estado que induce el bloque, simulándolo desde todos los estados posibles a la vez
+(no se conoce el estado de llegada hasta procesar los bloques anteriores). Después las
+funciones se componen en orden para obtener el estado final de la entrada completa.
+
+Las simulaciones desde distintos estados suelen converger pronto a un mismo estado, así que
+periódicamente se agrupan los estados activos repetidos; cuando sólo queda uno, el resto del
+bloque cuesta lo mismo que la simulación secuencial. Aun así, en el peor caso el trabajo por
+bloque crece con el número de estados, por lo que con DFA grandes (o entradas pequeñas, o un
+solo proceso) se usa la simulación secuencial de streamDFA.
+
+Como en streamDFA, los bytes se interpretan como latin-1 (un byte = un carácter).
+"""
+
+import io
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from streamDFA import stream_fullmatch
+
+DEFAULT_MAX_STATES = 64
+MIN_PARALLEL_BYTES = 8 << 20
+CHUNKS_PER_WORKER = 4
+DEDUP_INTERVAL = 64
+
+def _class_ids(dfa, data):
+    # Secuencia de ids de clase de data (str o bytes).
+    classes = dfa.char_class
+    if isinstance(data, str):
+        return (classes[symbol] for symbol in data)
+    byte_list = [classes[chr(b)] for b in range(256)]
+    if dfa.n_classes <= 256:
+        return bytes(data).translate(bytes(byte_list))
+    return (byte_list[b] for b in data)
+
+def chunk_mapping(dfa, data, starts=None):
+    """
+    Calcula la función de transición inducida por data.
+
+    Parámetros:
+      - dfa: CompiledDFA.
+      - data: bloque de la entrada (str o bytes).
+      - starts: filas de inicio a considerar; por defecto, todos los estados vivos del DFA.
+
+    Retorna:
+      - Diccionario fila de inicio -> fila final (0 si se alcanza el estado muerto).
+    """
+    n_classes = dfa.n_classes
+    table = dfa.table
+    if starts is None:
+        starts = range(n_classes, (dfa.n_states + 1) * n_classes, n_classes)
+    starts = list(starts)
+    # active: estados actuales distintos; owner[k]: índice en active del estado de starts[k].
+    active = list(dict.fromkeys(starts))
+    position = {s: j for j, s in enumerate(active)}
+    owner = [position[s] for s in starts]
+    ids = iter(_class_ids(dfa, data))
+    step = 0
+    while len(active) > 1:
+        cls = next(ids, None)
+        if cls is None:
+            break
+        active = [table[s + cls] for s in active]
+        step += 1
+        if step == DEDUP_INTERVAL:
+            step = 0
+            position = {}
+            remap = [position.setdefault(s, len(position)) for s in active]
+            if len(position) < len(active):
+                active = list(position)
+                owner = [remap[j] for j in owner]
+    if len(active) == 1:
+        # Todas las simulaciones convergieron: basta seguir un único estado.
+        state = active[0]
+        if state:
+            for cls in ids:
+                state = table[state + cls]
+                if not state:
+                    break
+        active[0] = state
+    return {start: active[j] for start, j in zip(starts, owner)}
+
+# Estado de cada proceso del pool: el DFA se envía una sola vez en el inicializador.
+_worker_dfa = None
+
+def _init_worker(dfa):
+    global _worker_dfa
+    _worker_dfa = dfa
+
+def _map_file_range(task):
+    path, offset, length, starts = task
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            data = mm[offset:offset + length]
+    return chunk_mapping(_worker_dfa, data, starts)
+
+def _map_bytes(task):
+    data, starts = task
+    return chunk_mapping(_worker_dfa, data, starts)
+
+def speculation_profitable(dfa, size, workers, max_states=DEFAULT_MAX_STATES, min_size=MIN_PARALLEL_BYTES):
+    """Indica si conviene la simulación especulativa en paralelo frente a la secuencial."""
+    return workers > 1 and size >= min_size and dfa.n_states <= max_states
+
+def parallel_fullmatch(dfa, source, workers=None, chunk_size=None,
+                       max_states=DEFAULT_MAX_STATES, min_size=MIN_PARALLEL_BYTES):
+    """
+    Retorna True si la entrada completa es aceptada por el DFA, procesando bloques en paralelo.
+
+    Parámetros:
+      - dfa: CompiledDFA.
+      - source: ruta de archivo o bytes.
+      - workers: número de procesos (por defecto, os.cpu_count()).
+      - chunk_size: tamaño de cada bloque; por defecto la entrada se divide en
+        CHUNKS_PER_WORKER bloques por proceso.
+      - max_states, min_size: si el DFA tiene más estados o la entrada es más pequeña, se usa
+        la simulación secuencial (stream_fullmatch).
+    """
+    workers = workers or os.cpu_count() or 1
+    is_path = isinstance(source, (str, os.PathLike))
+    size = os.path.getsize(source) if is_path else len(source)
+    if not speculation_profitable(dfa, size, workers, max_states, min_size):
+        if is_path:
+            return stream_fullmatch(dfa, source)
+        return stream_fullmatch(dfa, io.BytesIO(source))
+    if chunk_size is None:
+        chunk_size = -(-size // (workers * CHUNKS_PER_WORKER))
+
+    offsets = range(0, size, chunk_size)
+    # El primer bloque sólo necesita simularse desde el estado inicial.
+    starts = [[dfa.initial]] + [None] * (len(offsets) - 1)
+    if is_path:
+        path = os.fspath(source)
+        tasks = [(path, offset, chunk_size, s) for offset, s in zip(offsets, starts)]
+        work = _map_file_range
+    else:
+        tasks = [(source[offset:offset + chunk_size], s) for offset, s in zip(offsets, starts)]
+        work = _map_bytes
+
+    state = dfa.initial
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(dfa,)) as pool:
+        for mapping in pool.map(work, tasks):
+            state = mapping[state]
+            if not state:
+                pool.shutdown(wait=False, cancel_futures=True)
+                return False
+    return state in dfa.accepting
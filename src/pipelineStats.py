@@ -0,0 +1,117 @@
+"""
+Estadísticas opcionales de compilación y de evaluación.
+
+Las funciones instrumentadas (compileRegex.build_minimized_dfa, minimize_dfa,
+simulateDFA.match_many, CompiledDFA.fullmatch_stats, ...) aceptan un parámetro stats que por
+defecto es None; en ese caso no se mide nada y se usa el camino sin instrumentar, por lo que
+el costo es una sola comparación por llamada (no por carácter).
+
+  - CompileStats: tiempos por etapa, número de posiciones (y las que eliminó la
+    simplificación del árbol), aristas de followpos, estados
+    creados por la construcción directa, iteraciones y divisiones de minimize_dfa y estados
+    antes y después de minimizar.
+  - MatchStats: cadenas evaluadas y aceptadas, caracteres procesados y salidas por el
+    estado muerto.
+
+Ambas tienen as_dict() para exportar los valores, y CompileStats acepta un callback
+on_stage(nombre, segundos) que se invoca al terminar cada etapa.
+"""
+
+import time
+from contextlib import contextmanager
+
+class CompileStats:
+    """
+    Estadísticas de una compilación.
+
+    Atributos:
+      - stage_times: diccionario etapa -> segundos (acumulados si la etapa se repite).
+      - positions: número de posiciones (hojas, incluido el marcador '$').
+      - positions_removed: posiciones eliminadas por simplifyAST.simplify_ast.
+      - followpos_edges: número total de pares (p, q) con q en followpos(p).
+      - dfa_states: estados creados por la construcción directa del AFD.
+      - minimize_iterations: bloques extraídos de la lista de trabajo en minimize_dfa.
+      - minimize_splits: divisiones de bloques en minimize_dfa.
+      - states_before / states_after: estados antes y después de minimizar.
+    """
+    __slots__ = ("stage_times", "positions", "positions_removed", "followpos_edges", "dfa_states", "minimize_iterations",
+                 "minimize_splits", "states_before", "states_after", "on_stage")
+
+    def __init__(self, on_stage=None):
+        self.stage_times = {}
+        self.positions = 0
+        self.positions_removed = 0
+        self.followpos_edges = 0
+        self.dfa_states = 0
+        self.minimize_iterations = 0
+        self.minimize_splits = 0
+        self.states_before = 0
+        self.states_after = 0
+        self.on_stage = on_stage
+
+    @contextmanager
+    def stage(self, name):
+        """Mide el tiempo del bloque with como la etapa name."""
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            elapsed = time.perf_counter() - start
+            self.stage_times[name] = self.stage_times.get(name, 0.0) + elapsed
+            if self.on_stage is not None:
+                self.on_stage(name, elapsed)
+
+    def record_positions(self, pos_dict, followpos):
+        """Registra las posiciones y las aristas de followpos (lista de ventanas o dict de conjuntos)."""
+        self.positions = len(pos_dict)
+        if isinstance(followpos, dict):
+            self.followpos_edges = sum(len(follow) for follow in followpos.values())
+        else:
+            self.followpos_edges = sum(bin(bits).count("1") for _, bits in followpos)
+
+    def record_minimize(self, states_before, states_after, iterations, splits):
+        """Registra los contadores de minimize_dfa."""
+        self.states_before = states_before
+        self.states_after = states_after
+        self.minimize_iterations = iterations
+        self.minimize_splits = splits
+
+    def as_dict(self):
+        return {name: (dict(getattr(self, name)) if name == "stage_times" else getattr(self, name))
+                for name in self.__slots__ if name != "on_stage"}
+
+    def __repr__(self):
+        return f"CompileStats({self.as_dict()})"
+
+class MatchStats:
+    """
+    Estadísticas de evaluación acumuladas.
+
+    Atributos:
+      - strings: cadenas evaluadas.
+      - accepted: cadenas aceptadas.
+      - characters: caracteres procesados (hasta el estado muerto si se alcanzó).
+      - dead_exits: cadenas rechazadas al alcanzar el estado muerto antes del final.
+    """
+    __slots__ = ("strings", "accepted", "characters", "dead_exits")
+
+    def __init__(self):
+        self.strings = 0
+        self.accepted = 0
+        self.characters = 0
+        self.dead_exits = 0
+
+    def record(self, characters, accepted, dead):
+        """Registra la evaluación de una cadena."""
+        self.strings += 1
+        self.characters += characters
+        if accepted:
+            self.accepted += 1
+        if dead:
+            self.dead_exits += 1
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return f"MatchStats({self.as_dict()})"
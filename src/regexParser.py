@@ -0,0 +1,242 @@
+"""
+Analizador de una sola pasada: de la cadena de la expresión regular directamente al árbol
+sintáctico.
+
+El pipeline por etapas recorre el patrón cinco veces (validar_regex lo escanea dos veces,
+tokenize, insertar_operador_concatenacion_tokens, infix_a_postfix_tokens y
+postfix_a_arbol_sintactico) y cada etapa produce una lista intermedia de tuplas. parse_regex
+hace todo en un solo recorrido:
+  - valida cada carácter (mismas reglas y mensajes que validar_regex),
+  - reconoce escapes y clases entre corchetes,
+  - inserta la concatenación implícita (mismas reglas que insertar_operador_concatenacion_tokens),
+  - aplica Shunting Yard con la misma precedencia y asociatividad que regexToSY, pero cada
+    operador que saldría a la notación postfix se aplica en el momento sobre la pila de
+    nodos (syToSyntaxTree.apply_operator), sin construir la lista postfix.
+No hay recursión, así que la profundidad de anidamiento no está limitada.
+
+El símbolo '#' sin escapar representa la cadena vacía (ε, syToSyntaxTree.EPSILON): produce una
+hoja LITERAL '#' que no ocupa posición en astToDFA. Para el carácter '#' se escribe "\#" o
+"[#]", que producen la hoja de clase "#".
+
+Los errores se reportan con RegexSyntaxError (subclase de ValueError) con el mismo mensaje y la
+misma prioridad que el pipeline por etapas: un carácter inválido (aunque aparezca al final)
+tiene prioridad sobre los paréntesis desbalanceados, y éstos sobre los errores de construcción
+del árbol (por ejemplo, "Error: Operador '*' sin operando."). Además, el error indica la
+posición del carácter o del operador que lo produjo y la etapa (stage) que lo habría reportado.
+"""
+
+import re
+
+from regexToSY import OPERADORES, PRECEDENCIA, ASOCIATIVIDAD
+from syToSyntaxTree import EPSILON, Nodo, bracket_leaf, apply_operator, extend_concatenation, finish_tree
+
+ALLOWED = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789#$|.+*()?\\[]")
+POSTFIX_OPERATORS = frozenset("*+?")
+
+# Secuencias de literales simples (sin escapes, clases, paréntesis ni operadores).
+_LITERAL_RUN = re.compile(r"[a-zA-Z0-9#$\]]+")
+_LITERAL_RUN_UNCHECKED = re.compile(r"[^|.*+?()\[\\]+")
+
+# Prioridad de las etapas: un error de una etapa anterior oculta los de las posteriores.
+STAGES = ("validar_regex", "tokenize", "infix_a_postfix", "postfix_a_arbol_sintactico")
+
+class RegexSyntaxError(ValueError):
+    """
+    Error de sintaxis en una expresión regular.
+
+    Atributos:
+      - position: índice en la cadena del carácter u operador que produjo el error
+        (para la concatenación implícita, el del operando que la sigue).
+      - stage: etapa del pipeline por etapas que reporta el mismo error.
+    """
+
+    def __init__(self, message, position, stage):
+        super().__init__(message)
+        self.position = position
+        self.stage = stage
+
+def _scan_bracket(regex, i, validate):
+    # Retorna (token "[...]" sin los escapes, índice del ']') para la clase que empieza en i.
+    n = len(regex)
+    j = i + 1
+    end = regex.find(']', j)
+    backslash = regex.find('\\', j, end if end >= 0 else n)
+    if backslash < 0 and end >= 0:
+        return regex[i:end + 1], end
+    parts = []
+    while j < n and regex[j] != ']':
+        if regex[j] == '\\':
+            j += 1
+            if j >= n:
+                if validate:
+                    raise RegexSyntaxError("Error: secuencia de escape incompleta dentro de clase de caracteres.",
+                                           j - 1, "validar_regex")
+                raise RegexSyntaxError("Secuencia de escape incompleta en clase de caracteres.", j - 1, "tokenize")
+        parts.append(regex[j])
+        j += 1
+    if j >= n:
+        if validate:
+            raise RegexSyntaxError("Error: clase de caracteres sin cerrar.", i, "validar_regex")
+        raise RegexSyntaxError("Expresión de clase de caracteres sin cerrar.", i, "tokenize")
+    return "[" + "".join(parts) + "]", j
+
+def parse_regex(regex, validate=True, make=Nodo):
+    """
+    Construye el árbol sintáctico de la expresión regular en una sola pasada.
+    El árbol es el mismo que produce postfix_a_arbol_sintactico(infix_a_postfix(regex)).
+
+    Si validate es True (por defecto) se aplican además las reglas de validar_regex (caracteres
+    permitidos y balance de paréntesis sobre el texto completo); con validate=False cualquier
+    carácter fuera de los operadores es un literal, como en infix_a_postfix. En ningún caso se
+    rechaza el símbolo reservado '$' (el árbol puede llevar ya el marcador): las entradas públicas
+    lo revisan con compileRegex.check_reserved_symbols.
+
+    make crea cada nodo (por defecto Nodo); con el método add de un compactAST.CompactAST el
+    árbol se construye directamente en arreglos y se retorna el índice de la raíz.
+
+    Lanza RegexSyntaxError (subclase de ValueError) si la expresión no es válida.
+    """
+    nodes = []          # Pila de construcción del árbol (ver syToSyntaxTree.apply_operator)
+    ops = []            # Pila de Shunting Yard: (operador o '(', posición)
+    raw_open = []       # Posiciones de '(' en el texto crudo (validar_regex también cuenta escapes y clases)
+    pending = None      # Primer error diferido de menor etapa: (índice de etapa, mensaje, posición)
+    building = True     # Se deja de construir el árbol tras el primer error de construcción
+    prev_operand = False
+    n = len(regex)
+    literal_run = (_LITERAL_RUN if validate else _LITERAL_RUN_UNCHECKED).match
+
+    def defer(stage, message, position):
+        nonlocal pending
+        rank = STAGES.index(stage)
+        if pending is None or rank < pending[0]:
+            pending = (rank, message, position)
+
+    def emit(op, position):
+        # El operador sale de la pila de Shunting Yard: se aplica sobre los nodos.
+        nonlocal building
+        if building:
+            try:
+                apply_operator(nodes, op, make)
+            except ValueError as e:
+                building = False
+                defer("postfix_a_arbol_sintactico", str(e), position)
+
+    def push_operator(op, position):
+        while ops and ops[-1][0] != '(':
+            top_op = ops[-1][0]
+            if ((ASOCIATIVIDAD[op] == 'left' and PRECEDENCIA[op] <= PRECEDENCIA[top_op]) or
+                    (ASOCIATIVIDAD[op] == 'right' and PRECEDENCIA[op] < PRECEDENCIA[top_op])):
+                emit(*ops.pop())
+            else:
+                break
+        ops.append((op, position))
+
+    def raw_paren(char, position):
+        if not validate:
+            return
+        if char == '(':
+            raw_open.append(position)
+        elif char == ')':
+            if raw_open:
+                raw_open.pop()
+            else:
+                defer("validar_regex", "Error: paréntesis de cierre sin correspondencia.", position)
+
+    i = 0
+    while i < n:
+        char = regex[i]
+        start = i
+        if char == '\\':
+            i += 1
+            if i >= n:
+                if validate:
+                    raise RegexSyntaxError("Error: secuencia de escape incompleta.", start, "validar_regex")
+                raise RegexSyntaxError("Secuencia de escape incompleta.", start, "tokenize")
+            # Se acepta cualquier carácter escapado, como literal. "\#" produce la misma hoja
+            # que "[#]": la hoja LITERAL '#' es ε (EPSILON).
+            raw_paren(regex[i], i)
+            if regex[i] == EPSILON:
+                symbol, token_type = "[" + EPSILON + "]", "BRACKET"
+            else:
+                symbol, token_type = regex[i], "LITERAL"
+        elif char == '[':
+            bracket, i = _scan_bracket(regex, i, validate)
+            if validate:
+                for k in range(start + 1, i):
+                    if regex[k] == '(' or regex[k] == ')':
+                        raw_paren(regex[k], k)
+            symbol, token_type = bracket, "BRACKET"
+        elif char == '(':
+            raw_paren(char, i)
+            if prev_operand:
+                push_operator('.', i)
+            ops.append(('(', i))
+            prev_operand = False
+            i += 1
+            continue
+        elif char == ')':
+            raw_paren(char, i)
+            while ops and ops[-1][0] != '(':
+                emit(*ops.pop())
+            if ops:
+                ops.pop()
+            else:
+                defer("infix_a_postfix", "Error: Paréntesis no balanceados.", i)
+            prev_operand = True
+            i += 1
+            continue
+        elif char in OPERADORES:
+            push_operator(char, i)
+            prev_operand = char in POSTFIX_OPERATORS
+            i += 1
+            continue
+        else:
+            if validate and char not in ALLOWED:
+                raise RegexSyntaxError(f"Caracter inválido encontrado: '{char}'", i, "validar_regex")
+            if prev_operand and building and ops and ops[-1][0] == '.' and len(nodes) >= 2:
+                # Dentro de una concatenación (el tope es el '.' del operando anterior), cada
+                # literal sólo aplica ese '.' y apila el siguiente: se procesa la secuencia
+                # completa de literales simples de una vez.
+                end = literal_run(regex, i).end()
+                leaves = [make(c, "LITERAL") for c in regex[i:end]]
+                apply_operator(nodes, '.', make)
+                extend_concatenation(nodes, leaves[:-1], make)
+                nodes.append(leaves[-1])
+                i = end
+                continue
+            symbol, token_type = char, "LITERAL"
+
+        # Operando (literal, escape o clase): concatenación implícita con el anterior. El '.'
+        # entra a la pila antes de crear la hoja, igual que en la notación postfix, de modo que
+        # las hojas se crean en el orden del árbol (un '?' pendiente crea su hoja '#' antes).
+        if prev_operand:
+            push_operator('.', start)
+        if building:
+            try:
+                leaf = bracket_leaf(symbol, make) if token_type == "BRACKET" else make(symbol, token_type)
+            except ValueError as e:
+                # Por ejemplo, "[]": postfix_a_arbol_sintactico lo reporta al crear la hoja.
+                building = False
+                defer("postfix_a_arbol_sintactico", str(e), start)
+            else:
+                nodes.append(leaf)
+        prev_operand = True
+        i += 1
+
+    if raw_open:
+        defer("validar_regex", "Error: paréntesis de apertura sin correspondencia.", raw_open[-1])
+    while ops:
+        op, position = ops.pop()
+        if op == '(':
+            defer("infix_a_postfix", "Error: Paréntesis no balanceados.", position)
+            break
+        emit(op, position)
+    if building:
+        try:
+            tree = finish_tree(nodes, make)
+        except ValueError as e:
+            defer("postfix_a_arbol_sintactico", str(e), n)
+    if pending is not None:
+        rank, message, position = pending
+        raise RegexSyntaxError(message, position, STAGES[rank])
+    return tree
@@ -1,3 +1,5 @@
+from syToSyntaxTree import EPSILON
+
 OPERADORES = {'|', '.', '*', '+', '?'}
 PRECEDENCIA = {'*': 4, '+': 4, '?': 4, '.': 3, '|': 2}
 ASOCIATIVIDAD = {'*': 'right', '+': 'right', '?': 'right', '.': 'left', '|': 'left'}
@@ -20,8 +22,12 @@ def tokenize(regex: str):
             i += 1
             if i >= len(regex):
                 raise ValueError("Secuencia de escape incompleta.")
-            # Se guarda el carácter escapado como literal.
-            tokens.append(("LITERAL", regex[i]))
+            # Se guarda el carácter escapado como literal; '#' sin escapar es ε (EPSILON), así
+            # que "\#" se guarda como la clase "[#]" para que coincida con el carácter '#'.
+            if regex[i] == EPSILON:
+                tokens.append(("BRACKET", "[" + EPSILON + "]"))
+            else:
+                tokens.append(("LITERAL", regex[i]))
         elif char == '[':
             # Reconocer clase de caracteres o rango.
             j = i + 1
@@ -0,0 +1,160 @@
+"""
+Búsqueda no anclada (search / finditer / findall) con semántica leftmost-longest
+a partir del árbol sintáctico producido por postfix_a_arbol_sintactico.
+
+Se compilan dos AFD minimizados:
+  - forward: el AFD anclado de R, que se usa para extender una coincidencia lo más posible
+    (longest match) desde un inicio conocido.
+  - reverse: el AFD no anclado de Σ*·reverso(R). Al recorrer el texto de derecha a izquierda,
+    este AFD está en un estado de aceptación justo después de leer text[i] si y sólo si
+    alguna coincidencia de R empieza en i.
+
+Así, una búsqueda recorre el texto una vez hacia atrás para ubicar el inicio más a la
+izquierda y luego una vez hacia adelante desde ese inicio, sin reiniciar la simulación en
+cada posición como haría un ciclo sobre simulate_dfa_with_derivation. En finditer, los
+recorridos hacia adelante de coincidencias sucesivas comparten los pares (estado, posición)
+que ya se sabe que no llevan a otra aceptación, de modo que ninguno se recorre dos veces.
+"""
+
+from regexParser import parse_regex
+from compileRegex import check_reserved_symbols
+from syToSyntaxTree import Nodo, iter_postorder, add_end_marker, strip_end_marker
+from astToDFA import direct_dfa_bitset
+from AFDtoMinimizedAFD import minimize_dfa
+from simulateDFA import CompiledDFA
+
+def reverse_ast(node):
+    """
+    Retorna una copia del árbol que reconoce el lenguaje reverso: se intercambian los
+    hijos de cada concatenación. El árbol original no se modifica.
+    """
+    copies = []
+    for n in iter_postorder(node):
+        right = copies.pop() if n.derecho is not None else None
+        left = copies.pop() if n.izquierdo is not None else None
+        if n.token_type == "OPERATOR" and n.valor == '.':
+            left, right = right, left
+        copies.append(Nodo(n.valor, n.token_type, left, right))
+    return copies[0]
+
+def _compile_tree(root, unanchored):
+    # (R . $) -> AFD directo (bitsets) -> minimización -> CompiledDFA.
+    dfa_transitions, accepting_states, _, _, _ = direct_dfa_bitset(add_end_marker(root), unanchored)
+    new_initial, new_transitions, new_accepting, _, _ = minimize_dfa(dfa_transitions, accepting_states)
+    default = new_initial if unanchored else None
+    return CompiledDFA(new_initial, new_transitions, new_accepting, default)
+
+class SearchDFA:
+    """
+    Buscador leftmost-longest construido a partir de un árbol sintáctico.
+
+    Parámetros:
+      - tree: árbol de postfix_a_arbol_sintactico, con o sin el marcador final '$'.
+
+    Las coincidencias se representan como tuplas (inicio, fin) con fin exclusivo.
+    """
+    __slots__ = ("forward", "reverse")
+
+    def __init__(self, tree):
+        root = strip_end_marker(tree)
+        self.forward = _compile_tree(root, unanchored=False)
+        self.reverse = _compile_tree(reverse_ast(root), unanchored=True)
+
+    @classmethod
+    def from_regex(cls, regex):
+        """
+        Construye el buscador directamente desde la expresión regular (sin el '$').
+        Lanza ValueError si la expresión usa el símbolo reservado '$'.
+        """
+        check_reserved_symbols(regex)
+        return cls(parse_regex(regex, validate=False))
+
+    def _starts(self, text, pos, end):
+        # Recorre text[pos:end] hacia atrás con el AFD de Σ*·reverso(R) y retorna un bytearray
+        # donde starts[i - pos] vale 1 si alguna coincidencia comienza en i.
+        rev = self.reverse
+        table = rev.table
+        classes = rev.char_class
+        accepting = rev.accepting
+        state = rev.initial
+        starts = bytearray(end - pos + 1)
+        if state in accepting:
+            starts[end - pos] = 1
+        for i in range(end - 1, pos - 1, -1):
+            state = table[state + classes[text[i]]]
+            if state in accepting:
+                starts[i - pos] = 1
+        return starts
+
+    def match_longest(self, text, pos=0, endpos=None):
+        """
+        Coincidencia anclada en pos: retorna el fin de la coincidencia más larga de R que
+        comienza en pos, o None si ninguna comienza allí.
+        """
+        end = len(text) if endpos is None else endpos
+        return self._longest(text, pos, end, None)
+
+    def _longest(self, text, pos, end, failed):
+        # Extiende la coincidencia desde pos con el AFD forward. failed (conjunto de pares
+        # (estado, posición) o None) guarda los pares de recorridos anteriores desde los que ya
+        # se sabe que no hay otra aceptación: al volver a uno, el recorrido se corta. Se le
+        # agregan los pares visitados después de la última aceptación de este recorrido, así
+        # que cada par se recorre a lo más una vez entre todas las llamadas de finditer.
+        fwd = self.forward
+        table = fwd.table
+        classes = fwd.char_class
+        accepting = fwd.accepting
+        state = fwd.initial
+        last = pos if state in accepting else None
+        trail = []          # Estados visitados desde la última aceptación
+        trail_start = pos + 1
+        for i in range(pos, end):
+            state = table[state + classes[text[i]]]
+            if not state:
+                break
+            if failed is not None and (state, i + 1) in failed:
+                break
+            if state in accepting:
+                last = i + 1
+                trail.clear()
+                trail_start = i + 2
+            elif failed is not None:
+                trail.append(state)
+        if failed is not None:
+            failed.update(zip(trail, range(trail_start, trail_start + len(trail))))
+        return last
+
+    def search(self, text, pos=0, endpos=None):
+        """
+        Retorna la primera coincidencia (la que empieza más a la izquierda y, entre ellas,
+        la más larga) en text[pos:endpos] como (inicio, fin), o None si no hay coincidencias.
+        """
+        end = len(text) if endpos is None else endpos
+        starts = self._starts(text, pos, end)
+        first = starts.find(1)
+        if first < 0:
+            return None
+        start = pos + first
+        return start, self.match_longest(text, start, end)
+
+    def finditer(self, text, pos=0, endpos=None):
+        """
+        Produce todas las coincidencias leftmost-longest que no se solapan, de izquierda a
+        derecha. Después de una coincidencia vacía se avanza un carácter.
+        """
+        end = len(text) if endpos is None else endpos
+        starts = self._starts(text, pos, end)
+        failed = set()      # Ver _longest: el total de pasos hacia adelante es lineal en el texto.
+        offset = 0
+        while True:
+            first = starts.find(1, offset)
+            if first < 0:
+                return
+            start = pos + first
+            stop = self._longest(text, start, end, failed)
+            yield start, stop
+            offset = stop - pos if stop > start else first + 1
+
+    def findall(self, text, pos=0, endpos=None):
+        """Retorna la lista de subcadenas de todas las coincidencias (ver finditer)."""
+        return [text[start:stop] for start, stop in self.finditer(text, pos, endpos)]
@@ -0,0 +1,248 @@
+"""
+Simplificación algebraica del árbol sintáctico antes de calcular followpos.
+
+Cada hoja del árbol es una posición del algoritmo directo, así que la estructura redundante
+se convierte en posiciones y estados de más que después minimize_dfa tiene que fusionar.
+simplify_ast reescribe el árbol compacto (compactAST.CompactAST) en uno equivalente con menos
+hojas, aplicando de abajo hacia arriba:
+  - Cerraduras: (X*)* = (X+)* = (X*)+ = X*, (X+)+ = X+, X+ = X* si X es anulable,
+    ε* = ε+ = ε, y (X|ε)* = (Y*|Z)* = (Y|Z)* (las ramas ε y las cerraduras dentro de una
+    cerradura sobran).
+  - Concatenación: se eliminan los ε y X*X* = X*.
+  - Unión: se eliminan las ramas repetidas y la rama ε si otra rama ya es anulable, se
+    factorizan los prefijos comunes (ab|ac = a(b|c), a|ab = a(b|ε)) y las ramas de un solo
+    símbolo (literales y clases) se fusionan en una sola clase (a|[b-d]|e = [a-e]).
+Las reglas conservan el lenguaje; la unión no conserva el orden de sus ramas, lo que sólo
+cambia la numeración de las posiciones.
+
+Los subárboles se representan como términos únicos (hash-consing): dos subárboles iguales
+tienen el mismo identificador, lo que permite comparar ramas en O(1). Las cadenas de '.' y '|'
+se guardan como términos n-arios y se vuelven a construir balanceadas (balanced_tree) al
+generar el árbol resultante; un término compartido se genera una vez por cada referencia,
+así que las posiciones siguen siendo distintas.
+"""
+
+from compactAST import CompactAST, TOKEN_TYPES, LITERAL, BRACKET, OPERATOR
+from syToSyntaxTree import EPSILON, balanced_tree
+from symbolClasses import label_ranges, normalize_ranges, ranges_label
+
+class _Terms:
+    """
+    Tabla de términos únicos.
+
+    Un término es (kind, valor, hijos): las hojas no tienen hijos, '*' y '+' tienen uno y
+    '.' y '|' tienen dos o más (n-arios, sin anidar el mismo operador).
+    """
+    __slots__ = ("ids", "terms", "nullable")
+
+    def __init__(self):
+        self.ids = {}
+        self.terms = []
+        self.nullable = bytearray()
+        self.intern(LITERAL, EPSILON, ())   # El término 0 es ε.
+
+    def intern(self, kind, value, children):
+        term = (kind, value, children)
+        t = self.ids.get(term)
+        if t is not None:
+            return t
+        t = self.ids[term] = len(self.terms)
+        self.terms.append(term)
+        nullable = self.nullable
+        if not children:
+            nullable.append(kind == LITERAL and value == EPSILON)
+        elif value == '*':
+            nullable.append(True)
+        elif value == '+':
+            nullable.append(nullable[children[0]])
+        elif value == '|':
+            nullable.append(any(nullable[c] for c in children))
+        else:
+            nullable.append(all(nullable[c] for c in children))
+        return t
+
+    def _op(self, t):
+        kind, value, _ = self.terms[t]
+        return value if kind == OPERATOR else None
+
+    def star(self, t):
+        op = self._op(t)
+        if t == _EPS or op == '*':
+            return t
+        if op == '+':
+            return self.star(self.terms[t][2][0])
+        if op == '|':
+            # Dentro de una cerradura, las ramas ε y las cerraduras de cada rama sobran.
+            branches = [self.terms[b][2][0] if self._op(b) in ('*', '+') else b
+                        for b in self.terms[t][2] if b != _EPS]
+            t = self.alternation(branches)
+            op = self._op(t)
+            if t == _EPS or op in ('*', '+'):
+                return self.star(t)
+        return self.intern(OPERATOR, '*', (t,))
+
+    def plus(self, t):
+        if t == _EPS or self._op(t) in ('*', '+'):
+            return t
+        if self.nullable[t]:
+            return self.star(t)
+        return self.intern(OPERATOR, '+', (t,))
+
+    def concatenation(self, operands):
+        seq = []
+        for t in operands:
+            if t == _EPS:
+                continue
+            if self._op(t) == '.':
+                seq.extend(self.terms[t][2])
+            elif not (seq and seq[-1] == t and self._op(t) == '*'):
+                seq.append(t)
+        if not seq:
+            return _EPS
+        if len(seq) == 1:
+            return seq[0]
+        return self.intern(OPERATOR, '.', tuple(seq))
+
+    def alternation(self, operands):
+        branches = []
+        seen = set()
+        has_epsilon = False
+        for t in operands:
+            for b in (self.terms[t][2] if self._op(t) == '|' else (t,)):
+                if b == _EPS:
+                    has_epsilon = True
+                elif b not in seen:
+                    seen.add(b)
+                    branches.append(b)
+        heads = {self._sequence(b)[0] for b in branches}
+        if len(heads) < len(branches):
+            return self._factor(branches, has_epsilon)
+        return self._finish_alternation(branches, has_epsilon)
+
+    def _sequence(self, t):
+        return self.terms[t][2] if self._op(t) == '.' else (t,)
+
+    def _factor(self, branches, has_epsilon):
+        # Trie de las ramas (como secuencias de términos); cada nodo con más de una salida, o
+        # en el que termina una rama, es una unión. Los hijos tienen índices mayores que su
+        # padre, así que el trie se convierte de abajo hacia arriba sin recursión.
+        children = [{}]
+        ends = [has_epsilon]
+        for b in branches:
+            node = 0
+            for item in self._sequence(b):
+                child = children[node].get(item)
+                if child is None:
+                    child = children[node][item] = len(children)
+                    children.append({})
+                    ends.append(False)
+                node = child
+            ends[node] = True
+
+        # suffix[node]: secuencia (invertida) de términos que sigue al nodo.
+        suffix = [None] * len(children)
+        for node in range(len(children) - 1, -1, -1):
+            out = children[node]
+            if len(out) == 1 and not ends[node]:
+                (item, child), = out.items()
+                rest = suffix[child]
+                rest.append(item)
+                suffix[node] = rest
+                suffix[child] = None
+                continue
+            options = []
+            for item, child in out.items():
+                rest = suffix[child]
+                rest.append(item)
+                options.append(self.concatenation(reversed(rest)))
+                suffix[child] = None
+            suffix[node] = [self._finish_alternation(options, ends[node])] if options else []
+        return self.concatenation(reversed(suffix[0]))
+
+    def _finish_alternation(self, branches, has_epsilon):
+        # Ramas distintas y sin prefijos comunes: se fusionan las de un solo símbolo en una clase.
+        singles = [b for b in branches if self.terms[b][0] != OPERATOR]
+        if len(singles) > 1:
+            ranges = normalize_ranges([r for b in singles for r in label_ranges(self.terms[b][1])])
+            merged = self.intern(BRACKET, ranges_label(ranges), ())
+            first = singles[0]
+            singles = set(singles)
+            branches = [merged if b == first else b for b in branches if b == first or b not in singles]
+        if has_epsilon and not any(self.nullable[b] for b in branches):
+            branches.append(_EPS)
+        if not branches:
+            return _EPS
+        if len(branches) == 1:
+            return branches[0]
+        return self.intern(OPERATOR, '|', tuple(branches))
+
+_EPS = 0
+
+def _count_positions(ast):
+    return sum(1 for kind, value in zip(ast.kinds, ast.values)
+               if kind != OPERATOR and not (kind == LITERAL and value == EPSILON))
+
+def simplify_ast(ast):
+    """
+    Retorna (árbol simplificado, posiciones eliminadas) para un CompactAST sin el marcador '$'
+    (el marcador se agrega después, con add_end_marker, para no fusionarlo con otras ramas).
+    El árbol original no se modifica.
+    """
+    kinds, values, left, right = ast.kinds, ast.values, ast.left, ast.right
+    n = len(values)
+    terms = _Terms()
+
+    # Un '.' o '|' cuyo padre es el mismo operador es parte de la cadena de su padre: sólo
+    # se procesa la raíz de cada cadena, con todos sus operandos a la vez.
+    in_run = bytearray(n)
+    for i in range(n):
+        if kinds[i] == OPERATOR and values[i] in ('.', '|'):
+            for child in (left[i], right[i]):
+                if kinds[child] == OPERATOR and values[child] == values[i]:
+                    in_run[child] = 1
+
+    term_of = [None] * n
+    for i in range(n):
+        kind, value = kinds[i], values[i]
+        if kind != OPERATOR:
+            term_of[i] = _EPS if kind == LITERAL and value == EPSILON else terms.intern(kind, value, ())
+        elif value == '*':
+            term_of[i] = terms.star(term_of[left[i]])
+        elif value == '+':
+            term_of[i] = terms.plus(term_of[left[i]])
+        elif value in ('.', '|'):
+            if in_run[i]:
+                continue
+            operands = []
+            stack = [i]
+            while stack:
+                j = stack.pop()
+                if j == i or in_run[j]:
+                    stack.append(right[j])
+                    stack.append(left[j])
+                else:
+                    operands.append(term_of[j])
+            term_of[i] = (terms.concatenation if value == '.' else terms.alternation)(operands)
+        else:
+            raise ValueError(f"Operador desconocido en simplify_ast: {value}")
+
+    # Se genera el árbol resultante en postorden (los hijos antes que el padre).
+    simplified = CompactAST()
+    results = []
+    stack = [(term_of[n - 1], False)]
+    while stack:
+        t, expanded = stack.pop()
+        kind, value, children = terms.terms[t]
+        if not children:
+            results.append(simplified.add(value, TOKEN_TYPES[kind]))
+        elif not expanded:
+            stack.append((t, True))
+            stack.extend((c, False) for c in reversed(children))
+        else:
+            args = results[-len(children):]
+            del results[-len(children):]
+            if len(args) == 1:
+                results.append(simplified.add(value, "OPERATOR", args[0]))
+            else:
+                results.append(balanced_tree(value, args, simplified.add))
+    return simplified, _count_positions(ast) - _count_positions(simplified)
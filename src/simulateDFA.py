@@ -7,11 +7,45 @@ Se espera que se le suministre:
   - accepting_states: conjunto de estados (números) que son de aceptación.
   
 El módulo incluye:
+  - simulate_dfa: simulación silenciosa; devuelve True si la cadena es aceptada.
   - simulate_dfa_with_derivation: función que, dada una cadena de entrada, simula el DFA, 
-      imprime la derivación y devuelve True si es aceptada, False en caso contrario.
+      imprime la derivación y devuelve True si es aceptada, False en caso contrario (modo depuración).
   - process_input: función que permite ingresar cadenas de forma interactiva y muestra el resultado de la simulación.
+  - CompiledDFA: versión compilada del DFA minimizado con una tabla de transiciones densa,
+      pensada para evaluar muchas cadenas sin imprimir derivaciones.
+  - iter_matches, match_many, match_file: API por lotes sobre un CompiledDFA, sin impresión
+      ni derivaciones.
 """
 
+from array import array
+
+from symbolClasses import SymbolClassMap, label_classifier, label_ranges
+
+def symbol_classifier(transitions):
+    """
+    Retorna un diccionario carácter -> etiqueta de transición para las etiquetas de un DFA
+    (caracteres sueltos o clases de rangos como "[A-Z]"); los caracteres sin clase dan None.
+    """
+    return label_classifier({symbol for trans in transitions.values() for symbol in trans})
+
+def simulate_dfa(transitions, initial_state, accepting_states, input_string):
+    """
+    Simula el DFA sobre la cadena de entrada sin imprimir ni construir la derivación.
+    Recibe los mismos parámetros que simulate_dfa_with_derivation.
+
+    Retorna:
+      - True si, tras procesar la cadena, el estado actual es de aceptación.
+      - False en caso contrario (incluido el caso en que falta una transición).
+    """
+    classify = symbol_classifier(transitions)
+    current_state = initial_state
+    for symbol in input_string:
+        next_state = transitions.get(current_state, {}).get(classify[symbol])
+        if next_state is None:
+            return False
+        current_state = next_state
+    return current_state in accepting_states
+
 def simulate_dfa_with_derivation(transitions, initial_state, accepting_states, input_string):
     """
     Simula el DFA sobre la cadena de entrada, mostrando la derivación paso a paso.
@@ -33,19 +67,24 @@ def simulate_dfa_with_derivation(transitions, initial_state, accepting_states, i
       - False en caso contrario.
     """
     derivation = []  # Lista para almacenar los pasos de la derivación
+    classify = symbol_classifier(transitions)
     current_state = initial_state
     derivation.append(f"Estado inicial: {current_state}")
     
     for symbol in input_string:
         # Si no existe una transición para el símbolo en el estado actual, se indica error en la derivación.
-        if symbol not in transitions.get(current_state, {}):
+        label = classify[symbol]
+        if label not in transitions.get(current_state, {}):
             derivation.append(f"No existe transición para el símbolo '{symbol}' en el estado {current_state}.")
             print("Derivación:")
             for line in derivation:
                 print(line)
             return False
-        next_state = transitions[current_state][symbol]
-        derivation.append(f"Estado {current_state} -- {symbol} --> Estado {next_state}")
+        next_state = transitions[current_state][label]
+        if label == symbol:
+            derivation.append(f"Estado {current_state} -- {symbol} --> Estado {next_state}")
+        else:
+            derivation.append(f"Estado {current_state} -- {symbol} ∈ {label} --> Estado {next_state}")
         current_state = next_state
     
     # Imprime la derivación completa
@@ -56,10 +95,11 @@ def simulate_dfa_with_derivation(transitions, initial_state, accepting_states, i
     # Retorna True si el estado final es de aceptación
     return current_state in accepting_states
 
-def process_input(transitions, initial_state, accepting_states):
+def process_input(transitions, initial_state, accepting_states, debug=False):
     """
     Permite al usuario ingresar cadenas para ser procesadas por el DFA.
-    Para cada cadena, muestra la derivación y el resultado de la simulación.
+    Para cada cadena, muestra el resultado de la simulación; si debug es True,
+    muestra además la derivación paso a paso.
     
     La función finaliza cuando el usuario ingresa una cadena vacía.
     """
@@ -68,8 +108,230 @@ def process_input(transitions, initial_state, accepting_states):
         s = input("Cadena: ")
         if s == "":
             break
-        result = simulate_dfa_with_derivation(transitions, initial_state, accepting_states, s)
+        if debug:
+            result = simulate_dfa_with_derivation(transitions, initial_state, accepting_states, s)
+        else:
+            result = simulate_dfa(transitions, initial_state, accepting_states, s)
         if result:
             print("  Cadena aceptada\n")
         else:
-            print("  Cadena rechazada\n")
\ No newline at end of file
+            print("  Cadena rechazada\n")
+
+class CompiledDFA:
+    """
+    DFA compilado a partir de la salida de minimize_dfa (new_initial, new_transitions, new_accepting).
+
+    Representación:
+      - Los caracteres del alfabeto se agrupan en clases de símbolos densas: dos caracteres
+        comparten clase si producen la misma transición en todos los estados. La clase 0 se
+        reserva para los caracteres fuera del alfabeto.
+      - Las transiciones se guardan en un arreglo plano array('i') de tamaño
+        (n_states + 1) * n_classes. Cada estado se representa directamente por el desplazamiento
+        de su fila (estado * n_classes), de modo que un paso es table[estado + clase].
+      - La fila 0 es el estado muerto reservado: todas sus transiciones vuelven a 0, y
+        cualquier transición inexistente en el DFA original apunta a él.
+      - Si se indica default, los caracteres fuera del alfabeto (clase 0) llevan a ese estado
+        desde cualquier estado vivo en lugar de al estado muerto (útil para AFD de búsqueda Σ*·R).
+
+    Atributos:
+      - n_states: número de estados del DFA minimizado (sin contar el estado muerto).
+      - n_classes: número de clases de símbolos (incluida la clase 0).
+      - char_class: SymbolClassMap carácter -> clase (los caracteres latin-1 y los de rangos
+        pequeños se guardan directamente; los de rangos anchos se resuelven por búsqueda binaria).
+      - table: arreglo plano de transiciones.
+      - initial: fila del estado inicial.
+      - accepting: conjunto congelado con las filas de los estados de aceptación.
+      - states: tupla que mapea índice interno (1..n_states) -> estado original (states[0] es None).
+
+    Las instancias son inmutables (asignar un atributo lanza AttributeError) para que una misma
+    instancia pueda compartirse entre hilos y llamadores; también se pueden serializar con pickle.
+    """
+    __slots__ = ("n_states", "n_classes", "char_class", "table", "initial", "accepting", "states")
+
+    def __init__(self, new_initial, new_transitions, new_accepting, default=None):
+        # Numerar los estados: 0 es el estado muerto, 1..n los estados del DFA
+        # (incluidos los que sólo aparecen como destino o como estado inicial).
+        states = [None] + list(new_transitions.keys())
+        index = {s: i for i, s in enumerate(states) if i}
+        extra = [new_initial] if default is None else [new_initial, default]
+        for s in extra + [d for trans in new_transitions.values() for d in trans.values()]:
+            if s not in index:
+                index[s] = len(states)
+                states.append(s)
+
+        # Agrupar los símbolos por columna (destino en cada estado) para obtener las clases.
+        symbols = []
+        seen = set()
+        for trans in new_transitions.values():
+            for sym in trans:
+                if sym not in seen:
+                    seen.add(sym)
+                    symbols.append(sym)
+        # La columna de la clase 0 es la de los caracteres fuera del alfabeto; un símbolo con la
+        # misma columna no necesita clase propia.
+        default_row = 0 if default is None else index[default]
+        column_class = {(default_row,) * (len(states) - 1): 0}
+        label_class = {}
+        class_rep = [None]
+        for sym in symbols:
+            column = tuple(index[new_transitions[s][sym]] if sym in new_transitions.get(s, {}) else 0
+                           for s in states[1:])
+            cls = column_class.get(column)
+            if cls is None:
+                cls = column_class[column] = len(class_rep)
+                class_rep.append(sym)
+            if cls:
+                label_class[sym] = cls
+        n_classes = len(class_rep)
+        # Las etiquetas son disjuntas (caracteres o clases de rangos), así que cada carácter
+        # tiene a lo sumo una clase.
+        char_class = SymbolClassMap(((label_ranges(sym), cls) for sym, cls in label_class.items()),
+                                    missing=0, prefill=map(chr, range(256)))
+
+        # Tabla plana: cada estado se identifica por el desplazamiento de su fila.
+        n_states = len(states) - 1
+        table = array('i', bytes(4 * (n_states + 1) * n_classes))
+        for s, i in index.items():
+            row = i * n_classes
+            trans = new_transitions.get(s, {})
+            if default_row:
+                table[row] = default_row * n_classes
+            for cls in range(1, n_classes):
+                dest = trans.get(class_rep[cls])
+                if dest is not None:
+                    table[row + cls] = index[dest] * n_classes
+
+        self._freeze(n_states, n_classes, char_class, table, index[new_initial] * n_classes,
+                     frozenset(index[s] * n_classes for s in new_accepting if s in index),
+                     tuple(states))
+
+    def _freeze(self, *values):
+        # Única vía de asignación de atributos; después la instancia queda inmutable.
+        for name, value in zip(self.__slots__, values):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"CompiledDFA es inmutable: no se puede asignar '{name}'.")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"CompiledDFA es inmutable: no se puede eliminar '{name}'.")
+
+    def __reduce__(self):
+        return (_rebuild_compiled_dfa, tuple(getattr(self, name) for name in self.__slots__))
+
+    def fullmatch(self, input_string):
+        """
+        Retorna True si la cadena completa pertenece al lenguaje del DFA.
+        El ciclo sólo consulta la clase del carácter y la tabla plana; no construye cadenas
+        ni estructuras intermedias, y termina en cuanto se alcanza el estado muerto.
+        """
+        table = self.table
+        classes = self.char_class
+        state = self.initial
+        for symbol in input_string:
+            state = table[state + classes[symbol]]
+            if not state:
+                return False
+        return state in self.accepting
+
+    def fullmatch_stats(self, input_string, stats):
+        """
+        Igual que fullmatch, pero registra en stats (pipelineStats.MatchStats) los caracteres
+        procesados y si la cadena terminó en el estado muerto.
+        """
+        table = self.table
+        classes = self.char_class
+        state = self.initial
+        consumed = 0
+        for symbol in input_string:
+            state = table[state + classes[symbol]]
+            consumed += 1
+            if not state:
+                stats.record(consumed, False, True)
+                return False
+        accepted = state in self.accepting
+        stats.record(consumed, accepted, False)
+        return accepted
+
+    def state_of(self, row):
+        """Retorna el estado original del DFA minimizado que corresponde a una fila de la tabla."""
+        return self.states[row // self.n_classes]
+
+def _rebuild_compiled_dfa(*values):
+    dfa = CompiledDFA.__new__(CompiledDFA)
+    dfa._freeze(*values)
+    return dfa
+
+class MatchSummary:
+    """
+    Resultado de una evaluación por lotes.
+      - total: número de registros evaluados.
+      - accepted: número de registros aceptados.
+      - indices: lista con los índices (base 0) de los registros aceptados, o None si no se pidieron.
+      - offsets: lista con el desplazamiento en bytes del inicio de cada registro aceptado
+        (sólo en evaluaciones sobre archivos que lo soportan), o None.
+    """
+    __slots__ = ("total", "accepted", "indices", "offsets")
+
+    def __init__(self, total, accepted, indices=None, offsets=None):
+        self.total = total
+        self.accepted = accepted
+        self.indices = indices
+        self.offsets = offsets
+
+    @property
+    def rejected(self):
+        return self.total - self.accepted
+
+    def __repr__(self):
+        return f"MatchSummary(total={self.total}, accepted={self.accepted}, rejected={self.rejected})"
+
+def iter_matches(dfa, strings):
+    """
+    Evalúa perezosamente cada cadena del iterable con dfa.fullmatch y produce un booleano
+    por cadena, en el mismo orden. No imprime nada ni construye derivaciones.
+    """
+    fullmatch = dfa.fullmatch
+    for s in strings:
+        yield fullmatch(s)
+
+def match_many(dfa, strings, indices=False, stats=None):
+    """
+    Evalúa todas las cadenas del iterable y retorna un MatchSummary con los conteos.
+    Si indices es True, el resumen incluye además los índices de las cadenas aceptadas.
+    Si se indica stats (pipelineStats.MatchStats), se acumulan en él los caracteres procesados
+    y las salidas por el estado muerto.
+    """
+    if stats is None:
+        fullmatch = dfa.fullmatch
+    else:
+        def fullmatch(s):
+            return dfa.fullmatch_stats(s, stats)
+    total = 0
+    accepted = 0
+    matched = [] if indices else None
+    for i, s in enumerate(strings):
+        total += 1
+        if fullmatch(s):
+            accepted += 1
+            if matched is not None:
+                matched.append(i)
+    return MatchSummary(total, accepted, matched)
+
+def iter_records(path, encoding="utf-8"):
+    """
+    Lee perezosamente un archivo de registros separados por saltos de línea y produce cada
+    registro sin el terminador ('\n' o '\r\n'). El archivo nunca se carga completo en memoria.
+    """
+    with open(path, "r", encoding=encoding, newline="\n") as f:
+        for line in f:
+            if line.endswith("\n"):
+                line = line[:-2] if line.endswith("\r\n") else line[:-1]
+            yield line
+
+def match_file(dfa, path, indices=False, encoding="utf-8", stats=None):
+    """
+    Evalúa cada registro (línea) del archivo y retorna un MatchSummary, igual que match_many.
+    Los índices corresponden al número de línea en base 0.
+    """
+    return match_many(dfa, iter_records(path, encoding), indices, stats)
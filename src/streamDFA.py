@@ -0,0 +1,241 @@
+"""
+Módulo para ejecutar un DFA compilado (CompiledDFA) sobre flujos de entrada grandes.
+
+El estado actual del DFA se conserva entre bloques (chunks), de modo que la entrada
+puede provenir de un archivo mapeado en memoria (mmap) o de cualquier flujo binario leído
+en bloques de tamaño fijo, sin cargar el archivo completo. La memoria usada es la de un
+bloque, independiente del tamaño total de la entrada.
+
+Se soportan dos modos:
+  - Flujo completo: la entrada entera es una sola cadena y al final se indica si fue aceptada.
+  - Registros: cada línea (terminada en '\n' o '\r\n') es una cadena independiente; el
+    estado vuelve al inicial en cada separador.
+
+Los bytes se interpretan como latin-1 (un byte = un carácter). Si el patrón usa caracteres
+fuera de ese rango, se puede indicar un encoding (por ejemplo "utf-8") y los bloques se
+decodifican de forma incremental.
+
+El módulo incluye:
+  - StreamMatcher: simulador reanudable (feed / finish / reset).
+  - iter_chunks: lector por bloques de una ruta (con mmap) o de un flujo binario.
+  - stream_fullmatch, iter_stream_records, stream_match_summary: atajos sobre StreamMatcher.
+"""
+
+import codecs
+import mmap
+import os
+
+from simulateDFA import MatchSummary
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+class StreamMatcher:
+    """
+    Simulador reanudable de un CompiledDFA.
+
+    Parámetros:
+      - dfa: instancia de CompiledDFA.
+      - records: si es True, cada línea se evalúa por separado (modo registros);
+        si es False, toda la entrada se evalúa como una sola cadena.
+      - encoding: si se indica, los bloques de bytes se decodifican incrementalmente con
+        este encoding; si es None, los bytes se interpretan como latin-1.
+
+    Atributos:
+      - state: fila actual en la tabla del DFA (0 es el estado muerto).
+      - record_count / accepted_count: registros completados y aceptados desde el último reset.
+    """
+    __slots__ = ("dfa", "records", "state", "record_count", "accepted_count",
+                 "_byte_map", "_byte_list", "_decoder", "_encoding", "_pending_cr", "_partial")
+
+    def __init__(self, dfa, records=False, encoding=None):
+        self.dfa = dfa
+        self.records = records
+        classes = dfa.char_class
+        self._byte_list = [classes[chr(b)] for b in range(256)]
+        # Con a lo sumo 256 clases, bytes.translate convierte un bloque entero a ids de clase.
+        self._byte_map = bytes(self._byte_list) if dfa.n_classes <= 256 else None
+        self._encoding = encoding
+        self.reset()
+
+    def reset(self):
+        """Vuelve al estado inicial y descarta cualquier registro parcial y contador."""
+        self.state = self.dfa.initial
+        self.record_count = 0
+        self.accepted_count = 0
+        self._pending_cr = False
+        self._partial = False
+        self._decoder = codecs.getincrementaldecoder(self._encoding)() if self._encoding else None
+
+    def _advance(self, state, data):
+        # Consume data (str o bytes) desde la fila state y retorna la fila final.
+        if not state or not data:
+            return state
+        table = self.dfa.table
+        if isinstance(data, str):
+            classes = self.dfa.char_class
+            for symbol in data:
+                state = table[state + classes[symbol]]
+                if not state:
+                    return 0
+        elif self._byte_map is not None:
+            for cls in bytes(data).translate(self._byte_map):
+                state = table[state + cls]
+                if not state:
+                    return 0
+        else:
+            byte_list = self._byte_list
+            for b in data:
+                state = table[state + byte_list[b]]
+                if not state:
+                    return 0
+        return state
+
+    def feed(self, chunk):
+        """
+        Procesa un bloque (bytes, bytearray, memoryview o str) continuando desde el estado actual.
+
+        Retorna:
+          - En modo registros: lista de booleanos, uno por cada registro completado en este bloque.
+          - En modo flujo completo: lista vacía.
+        """
+        if self._decoder is not None and not isinstance(chunk, str):
+            chunk = self._decoder.decode(chunk)
+        elif isinstance(chunk, memoryview):
+            chunk = chunk.tobytes()
+        if not self.records:
+            self.state = self._advance(self.state, chunk)
+            return []
+
+        if isinstance(chunk, str):
+            sep, cr = "\n", "\r"
+        else:
+            sep, cr = b"\n", b"\r"
+        accepting = self.dfa.accepting
+        initial = self.dfa.initial
+        state = self.state
+        # Un '\r' al final del bloque anterior sólo forma parte del registro si no le sigue '\n'.
+        if self._pending_cr and chunk:
+            self._pending_cr = False
+            if chunk[:1] != sep:
+                state = self._advance(state, cr)
+
+        results = []
+        start = 0
+        while True:
+            end = chunk.find(sep, start)
+            if end < 0:
+                break
+            stop = end - 1 if end > start and chunk[end - 1:end] == cr else end
+            state = self._advance(state, chunk[start:stop])
+            accepted = state in accepting
+            results.append(accepted)
+            self.record_count += 1
+            if accepted:
+                self.accepted_count += 1
+            state = initial
+            self._partial = False
+            start = end + 1
+
+        rest = chunk[start:]
+        if rest:
+            self._partial = True
+            if rest[-1:] == cr:
+                self._pending_cr = True
+                rest = rest[:-1]
+            state = self._advance(state, rest)
+        self.state = state
+        return results
+
+    def finish(self):
+        """
+        Indica el fin de la entrada.
+
+        Retorna:
+          - En modo flujo completo: True si la entrada completa fue aceptada.
+          - En modo registros: el resultado del último registro si no terminaba en salto de
+            línea, o None si no había registro pendiente.
+        """
+        if self._decoder is not None:
+            tail = self._decoder.decode(b"", final=True)
+            if tail:
+                self.feed(tail)
+        if not self.records:
+            return self.state in self.dfa.accepting
+        if not self._partial:
+            return None
+        state = self.state
+        if self._pending_cr:
+            self._pending_cr = False
+            state = self._advance(state, "\r")
+        accepted = state in self.dfa.accepting
+        self.record_count += 1
+        if accepted:
+            self.accepted_count += 1
+        self.state = self.dfa.initial
+        self._partial = False
+        return accepted
+
+def iter_chunks(source, chunk_size=DEFAULT_CHUNK_SIZE, use_mmap=True):
+    """
+    Produce bloques de a lo sumo chunk_size bytes.
+
+    Parámetros:
+      - source: ruta de archivo o flujo binario (objeto con read).
+      - chunk_size: tamaño de cada bloque.
+      - use_mmap: si source es una ruta, mapear el archivo en memoria en lugar de leerlo.
+    """
+    if isinstance(source, (str, bytes, os.PathLike)):
+        with open(source, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if use_mmap and size > 0:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    for offset in range(0, size, chunk_size):
+                        yield mm[offset:offset + chunk_size]
+            else:
+                yield from _read_chunks(f, chunk_size)
+    else:
+        yield from _read_chunks(source, chunk_size)
+
+def _read_chunks(stream, chunk_size):
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+def stream_fullmatch(dfa, source, chunk_size=DEFAULT_CHUNK_SIZE, encoding=None):
+    """
+    Retorna True si el contenido completo de source es aceptado por el DFA.
+    La lectura se detiene en cuanto el DFA alcanza el estado muerto.
+    """
+    matcher = StreamMatcher(dfa, records=False, encoding=encoding)
+    for chunk in iter_chunks(source, chunk_size):
+        matcher.feed(chunk)
+        if not matcher.state:
+            return False
+    return matcher.finish()
+
+def iter_stream_records(dfa, source, chunk_size=DEFAULT_CHUNK_SIZE, encoding=None):
+    """Produce un booleano por cada registro (línea) de source, en orden."""
+    matcher = StreamMatcher(dfa, records=True, encoding=encoding)
+    for chunk in iter_chunks(source, chunk_size):
+        yield from matcher.feed(chunk)
+    last = matcher.finish()
+    if last is not None:
+        yield last
+
+def stream_match_summary(dfa, source, indices=False, chunk_size=DEFAULT_CHUNK_SIZE, encoding=None):
+    """
+    Evalúa cada registro de source y retorna un MatchSummary (ver simulateDFA.match_many).
+    Los índices corresponden al número de línea en base 0.
+    """
+    total = 0
+    accepted = 0
+    matched = [] if indices else None
+    for i, result in enumerate(iter_stream_records(dfa, source, chunk_size, encoding)):
+        total += 1
+        if result:
+            accepted += 1
+            if matched is not None:
+                matched.append(i)
+    return MatchSummary(total, accepted, matched)
@@ -1,67 +1,121 @@
-from graphviz import Digraph
 import os
 import platform
-import copy  # Para hacer copias profundas de los nodos
+from collections import deque
+from symbolClasses import parse_bracket, ranges_label
 
 # Definimos los operadores
 OPERADORES = {'|', '.', '*', '+'}
 
+# Hoja de la cadena vacía (ε): una hoja LITERAL '#' es anulable y no ocupa posición en astToDFA.
+# Para el carácter '#' como tal se usa la clase "[#]".
+EPSILON = '#'
+
 class Nodo:
+    # __slots__ evita un diccionario por nodo. nullable, pos, firstpos y lastpos sólo los asigna
+    # astToDFA.compute_functions (el cálculo con conjuntos) y compute_followpos los libera.
+    __slots__ = ("valor", "token_type", "izquierdo", "derecho", "nullable", "pos", "firstpos", "lastpos")
+
     def __init__(self, valor, token_type=None, izquierdo=None, derecho=None):
         self.valor = valor          # El símbolo (literal, clase o operador)
-        self.token_type = token_type  # "LITERAL", "BRACKET" o "OPERATOR"
+        self.token_type = token_type  # "LITERAL", "BRACKET" (clase de rangos) o "OPERATOR"
         self.izquierdo = izquierdo
         self.derecho = derecho
 
     def __str__(self):
-        # Representación sencilla para depuración.
-        if self.izquierdo is None and self.derecho is None:
-            return self.valor
-        elif self.token_type == "OPERATOR" and self.valor in ["*", "+"]:
-            return f"({str(self.izquierdo)}{self.valor})"
-        else:
-            return f"({str(self.izquierdo)}{self.valor}{str(self.derecho)})"
+        # Representación sencilla para depuración (sin recursión, ver iter_postorder).
+        parts = []
+        for node in iter_postorder(self):
+            if node.izquierdo is None and node.derecho is None:
+                parts.append(node.valor)
+            elif node.derecho is None:
+                parts.append(f"({parts.pop()}{node.valor})")
+            else:
+                right = parts.pop()
+                parts.append(f"({parts.pop()}{node.valor}{right})")
+        return parts[0]
 
-def expand_bracket(bracket_value: str) -> Nodo:
+def iter_postorder(root):
     """
-    Expande un token de clase de caracteres (por ejemplo, "[A-Z]") en un árbol de unión.
-    Por ejemplo, "[A-C]" se expande a ((A|B)|C).
-    Se soportan rangos (con '-') y caracteres aislados.
+    Recorre el árbol en postorden (hijo izquierdo, hijo derecho, nodo) con una pila explícita,
+    de modo que la profundidad del árbol no está limitada por el límite de recursión de Python.
+    Las hojas se producen de izquierda a derecha.
     """
-    # Eliminar los corchetes inicial y final.
-    contenido = bracket_value[1:-1]
-    symbols = []
-    i = 0
-    while i < len(contenido):
-        if i + 2 < len(contenido) and contenido[i+1] == '-':
-            inicio = contenido[i]
-            fin = contenido[i+2]
-            for code in range(ord(inicio), ord(fin) + 1):
-                symbols.append(chr(code))
-            i += 3
-        else:
-            symbols.append(contenido[i])
-            i += 1
+    stack = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if expanded or (node.izquierdo is None and node.derecho is None):
+            yield node
+            continue
+        stack.append((node, True))
+        if node.derecho is not None:
+            stack.append((node.derecho, False))
+        if node.izquierdo is not None:
+            stack.append((node.izquierdo, False))
+
+def balanced_tree(op, nodes, make=Nodo):
+    """
+    Combina una lista no vacía de árboles con el operador asociativo op ('.' o '|') en un árbol
+    balanceado (profundidad logarítmica), conservando el orden de izquierda a derecha.
+
+    make crea cada nodo con los mismos argumentos que Nodo (valor, token_type, izquierdo,
+    derecho); con compactAST.CompactAST.add el árbol se construye en arreglos en lugar de objetos.
+    Lo mismo aplica al parámetro make de bracket_leaf, apply_operator, extend_concatenation
+    y finish_tree.
+    """
+    level = list(nodes)
+    while len(level) > 1:
+        paired = [make(op, "OPERATOR", level[i], level[i + 1])
+                  for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            paired.append(level[-1])
+        level = paired
+    return level[0]
+
+class _Run:
+    """Operandos consecutivos de un mismo operador asociativo, pendientes de balancear."""
+    __slots__ = ("op", "operands")
+
+    def __init__(self, op, operands):
+        self.op = op
+        self.operands = operands
+
+def _materialize(item, make=Nodo):
+    return balanced_tree(item.op, item.operands, make) if isinstance(item, _Run) else item
+
+def bracket_leaf(bracket_value: str, make=Nodo) -> Nodo:
+    """
+    Convierte un token de clase de caracteres (por ejemplo, "[A-Z]") en una única hoja de tipo
+    "BRACKET" cuyo valor es la etiqueta canónica de sus rangos (ver symbolClasses.py).
+    Por ejemplo, "[C-AB]" y "[A-C]" producen la hoja "[A-C]", y "[a]" produce la hoja "a".
+    La clase ocupa así una sola posición en astToDFA, sin importar cuántos caracteres contiene.
+    """
+    return make(ranges_label(parse_bracket(bracket_value)), "BRACKET")
 
-    if not symbols:
-        raise ValueError("Clase de caracteres vacía.")
+def add_end_marker(root: Nodo) -> Nodo:
+    """Retorna el árbol (R . $), que agrega el marcador de fin de cadena '$' a R."""
+    return Nodo('.', "OPERATOR", izquierdo=root, derecho=Nodo('$', "LITERAL"))
 
-    # Construir el árbol OR de forma left-associative:
-    nodo = Nodo(symbols[0], "LITERAL")
-    for sym in symbols[1:]:
-        nodo = Nodo('|', "OPERATOR", izquierdo=nodo, derecho=Nodo(sym, "LITERAL"))
-    return nodo
+def strip_end_marker(root: Nodo) -> Nodo:
+    """Si el árbol es (R . $), retorna R; en otro caso retorna el árbol sin cambios."""
+    if (root.token_type == "OPERATOR" and root.valor == '.'
+            and root.derecho is not None and root.derecho.izquierdo is None
+            and root.derecho.derecho is None and root.derecho.valor == '$'):
+        return root.izquierdo
+    return root
 
 def postfix_a_arbol_sintactico(postfix_tokens: list) -> Nodo:
     """
     Construye un árbol sintáctico a partir de una lista de tokens en notación postfix.
       - Si el token es de tipo "LITERAL", se crea un nodo hoja.
-      - Si el token es de tipo "BRACKET", se expande en un árbol OR mediante expand_bracket.
+      - Si el token es de tipo "BRACKET", se crea una hoja de clase de rangos mediante bracket_leaf.
       - Si el token es de tipo "OPERATOR":
-            • Si es un operador unario ('*') se extrae un operando.
-            • Si es el operador '+' se reescribe como concatenación de la expresión con su Kleene star,
-                es decir, se transforma X+ en X . (X)* (no se incluye el '+' en el árbol).
+            • Si es un operador unario ('*' o '+') se extrae un operando.
+                El '+' se conserva como nodo propio (astToDFA lo trata directamente) en lugar de
+                reescribir X+ como X . (X)*, que copiaba X y duplicaba el árbol en cada '+' anidado.
             • Si es un operador binario ('.' o '|') se extraen dos operandos.
+    Las cadenas de un mismo operador binario (por ejemplo, a.b.c.d o a|b|c|d) se acumulan y se
+    construyen como un árbol balanceado (balanced_tree) en lugar de una cadena de profundidad n;
+    como '.' y '|' son asociativos, el lenguaje y el orden de las hojas no cambian.
     """
     pila = []
     for token in postfix_tokens:
@@ -69,44 +123,65 @@ def postfix_a_arbol_sintactico(postfix_tokens: list) -> Nodo:
         if token_type == "LITERAL":
             pila.append(Nodo(token_value, token_type))
         elif token_type == "BRACKET":
-            nodo_bracket = expand_bracket(token_value)
-            pila.append(nodo_bracket)
+            pila.append(bracket_leaf(token_value))
         elif token_type == "OPERATOR":
-            if token_value == '*':
-                if not pila:
-                    raise ValueError("Error: Operador '*' sin operando.")
-                nodo = Nodo('*', token_type, izquierdo=pila.pop())
-                pila.append(nodo)
-            elif token_value == '+':
-                if not pila:
-                    raise ValueError("Error: Operador '+' sin operando.")
-                operand = pila.pop()
-                # Reescribir: X+ se transforma en X . (X)*  
-                nuevo_nodo = Nodo('.', "OPERATOR", izquierdo=operand, 
-                                    derecho=Nodo('*', "OPERATOR", izquierdo=copy.deepcopy(operand)))
-                pila.append(nuevo_nodo)
-            elif token_value == '?':
-                if not pila:
-                    raise ValueError("Error: Operador '?' sin operando.")
-                operand = pila.pop()
-                # Reescribir: X? se transforma en (X | ε), usando '#' para representar la cadena vacía (ε)
-                epsilon_node = Nodo('#', "LITERAL")
-                nuevo_nodo = Nodo('|', "OPERATOR", izquierdo=operand, derecho=epsilon_node)
-                pila.append(nuevo_nodo)
-            elif token_value in ['.', '|']:
-                if len(pila) < 2:
-                    raise ValueError(f"Error: Operador {token_value} sin suficientes operandos.")
-                derecho = pila.pop()
-                izquierdo = pila.pop()
-                nodo = Nodo(token_value, token_type, izquierdo, derecho)
-                pila.append(nodo)
-            else:
-                raise ValueError(f"Operador desconocido: {token_value}")
+            apply_operator(pila, token_value)
         else:
             raise ValueError(f"Token desconocido en postfix: {token}")
+    return finish_tree(pila)
+
+def apply_operator(pila, token_value, make=Nodo):
+    """
+    Aplica el operador token_value a los operandos del tope de la pila de construcción
+    (ver postfix_a_arbol_sintactico) y deja el resultado en la pila.
+    Lanza ValueError si faltan operandos.
+    """
+    if token_value in ['*', '+']:
+        if not pila:
+            raise ValueError(f"Error: Operador '{token_value}' sin operando.")
+        nodo = make(token_value, "OPERATOR", _materialize(pila.pop(), make))
+        pila.append(nodo)
+    elif token_value == '?':
+        if not pila:
+            raise ValueError("Error: Operador '?' sin operando.")
+        operand = _materialize(pila.pop(), make)
+        # Reescribir: X? se transforma en (X | ε), usando '#' para representar la cadena vacía (ε)
+        epsilon_node = make(EPSILON, "LITERAL")
+        nuevo_nodo = make('|', "OPERATOR", operand, epsilon_node)
+        pila.append(nuevo_nodo)
+    elif token_value in ['.', '|']:
+        if len(pila) < 2:
+            raise ValueError(f"Error: Operador {token_value} sin suficientes operandos.")
+        derecho = pila.pop()
+        izquierdo = pila.pop()
+        left_run = isinstance(izquierdo, _Run) and izquierdo.op == token_value
+        right_run = isinstance(derecho, _Run) and derecho.op == token_value
+        if right_run and (not left_run or len(derecho.operands) > len(izquierdo.operands)):
+            # Se agregan los operandos de la cadena más corta a la más larga.
+            run = derecho
+            run.operands.extendleft(reversed(izquierdo.operands) if left_run else [_materialize(izquierdo, make)])
+        else:
+            run = izquierdo if left_run else _Run(token_value, deque([_materialize(izquierdo, make)]))
+            run.operands.extend(derecho.operands if right_run else [_materialize(derecho, make)])
+        pila.append(run)
+    else:
+        raise ValueError(f"Operador desconocido: {token_value}")
+
+def extend_concatenation(pila, leaves, make=Nodo):
+    """
+    Concatena las hojas leaves, en orden, al elemento del tope de la pila de construcción.
+    Equivale a apilar cada hoja y aplicar '.' (apply_operator), pero en una sola operación.
+    """
+    top = pila[-1]
+    if not (isinstance(top, _Run) and top.op == '.'):
+        top = pila[-1] = _Run('.', deque([_materialize(top, make)]))
+    top.operands.extend(leaves)
+
+def finish_tree(pila, make=Nodo):
+    """Retorna el árbol final de la pila de construcción (debe quedar exactamente un elemento)."""
     if len(pila) != 1:
         raise ValueError("Error en la construcción del árbol sintáctico: elementos sobrantes en la pila.")
-    return pila[0]
+    return _materialize(pila[0], make)
 
 def visualizar_arbol_sintactico(arbol: Nodo, filename="syntax_tree"):
     """
@@ -116,22 +191,18 @@ def visualizar_arbol_sintactico(arbol: Nodo, filename="syntax_tree"):
       - Segunda línea: para hojas se asigna un número secuencial; para nodos internos (operadores),
         se asigna una letra griega. Si se agotan las letras, se reinicia desde el inicio agregando un subíndice.
     Se genera un archivo (por defecto syntax_tree.png) y se intenta abrir automáticamente.
+    graphviz se importa sólo aquí, de modo que construir árboles no requiere la dependencia.
     """
+    from graphviz import Digraph
+
     dot = Digraph()
     leaf_counter = [1]   # Contador mutable para hojas (números)
     branch_counter = [0] # Contador mutable para nodos internos (letras griegas)
     greek_letters = ['α','β','γ','δ','ε','ζ','η','θ','ι','κ','λ','μ','ν','ξ','ο','π','ρ','σ','τ','υ','φ','χ','ψ','ω']
 
-    def add_nodes(node):
+    # Recorrido postorden: los hijos se procesan antes que el nodo.
+    for node in iter_postorder(arbol):
         node_id = str(id(node))
-        left_id = None
-        right_id = None
-        # Recorrido postorden: procesamos primero los hijos.
-        if node.izquierdo is not None:
-            left_id = add_nodes(node.izquierdo)
-        if node.derecho is not None:
-            right_id = add_nodes(node.derecho)
-        
         if node.izquierdo is None and node.derecho is None:
             # Nodo hoja: asignar un número secuencial.
             label_sub = str(leaf_counter[0])
@@ -149,13 +220,10 @@ def visualizar_arbol_sintactico(arbol: Nodo, filename="syntax_tree"):
 
         label = f"{node.valor}\n{label_sub}"
         dot.node(node_id, label)
-        if left_id is not None:
-            dot.edge(node_id, left_id)
-        if right_id is not None:
-            dot.edge(node_id, right_id)
-        return node_id
-
-    add_nodes(arbol)
+        if node.izquierdo is not None:
+            dot.edge(node_id, str(id(node.izquierdo)))
+        if node.derecho is not None:
+            dot.edge(node_id, str(id(node.derecho)))
     output_path = dot.render(filename, format='png', cleanup=True)
 
     # Abrir la imagen automáticamente según el sistema operativo.
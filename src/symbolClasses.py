@@ -0,0 +1,220 @@
+"""
+Clases de símbolos basadas en rangos de caracteres.
+
+Una clase de caracteres como "[A-Z]" se representa como una lista ordenada de rangos
+disjuntos [(inicio, fin), ...] de puntos de código (ambos extremos inclusive), en lugar de
+expandirse en un árbol de uniones con una hoja por carácter.
+
+Cada conjunto de rangos tiene una etiqueta canónica que lo describe por completo:
+  - Si el conjunto es un único carácter, la etiqueta es ese carácter (por ejemplo 'a').
+  - En otro caso es una clase entre corchetes, por ejemplo "[A-Z]" o "[0-9a-f]". Dentro de
+    los corchetes, '\\', ']', '[', '-' y '^' se escapan con '\\', y los caracteres no imprimibles
+    se escriben como \\xHH, \\uHHHH o \\UHHHHHHHH.
+Por ello las transiciones del DFA pueden seguir siendo diccionarios { etiqueta: destino } y
+cualquier módulo puede recuperar los rangos a partir de la etiqueta.
+
+Antes de la determinización, partition_alphabet divide el alfabeto en clases de equivalencia
+disjuntas (caracteres que pertenecen exactamente a los mismos conjuntos), de modo que el
+costo de construir estados depende del número de clases y no del número de caracteres.
+"""
+
+from bisect import bisect_right
+
+# Los rangos con a lo sumo esta cantidad de caracteres se expanden en el diccionario de
+# clasificación; los más anchos se resuelven por búsqueda binaria.
+DICT_EXPANSION_LIMIT = 4096
+_LABEL_ESCAPES = set("\\[]-^")
+
+def normalize_ranges(ranges):
+    """Ordena y fusiona rangos solapados o contiguos."""
+    merged = []
+    for lo, hi in sorted(ranges):
+        if merged and lo <= merged[-1][1] + 1:
+            if hi > merged[-1][1]:
+                merged[-1] = (merged[-1][0], hi)
+        else:
+            merged.append((lo, hi))
+    return merged
+
+def parse_bracket(bracket_value):
+    """
+    Convierte un token de clase de caracteres (por ejemplo, "[A-Z]") en su lista de rangos.
+    Se soportan rangos (con '-') y caracteres aislados, igual que la antigua expansión en uniones.
+    """
+    contenido = bracket_value[1:-1]
+    ranges = []
+    i = 0
+    while i < len(contenido):
+        if i + 2 < len(contenido) and contenido[i + 1] == '-':
+            inicio = ord(contenido[i])
+            fin = ord(contenido[i + 2])
+            if inicio <= fin:
+                ranges.append((inicio, fin))
+            i += 3
+        else:
+            code = ord(contenido[i])
+            ranges.append((code, code))
+            i += 1
+    if not ranges:
+        raise ValueError("Clase de caracteres vacía.")
+    return normalize_ranges(ranges)
+
+def _label_char(code):
+    ch = chr(code)
+    if ch in _LABEL_ESCAPES:
+        return '\\' + ch
+    if ch.isprintable() and not ch.isspace():
+        return ch
+    if code <= 0xFF:
+        return f"\\x{code:02x}"
+    if code <= 0xFFFF:
+        return f"\\u{code:04x}"
+    return f"\\U{code:08x}"
+
+def ranges_label(ranges):
+    """Retorna la etiqueta canónica de una lista normalizada de rangos."""
+    if len(ranges) == 1 and ranges[0][0] == ranges[0][1]:
+        return chr(ranges[0][0])
+    parts = ["["]
+    for lo, hi in ranges:
+        parts.append(_label_char(lo))
+        if hi > lo:
+            if hi > lo + 1:
+                parts.append('-')
+            parts.append(_label_char(hi))
+    parts.append("]")
+    return "".join(parts)
+
+def label_ranges(label):
+    """Operación inversa de ranges_label: retorna la lista de rangos descrita por la etiqueta."""
+    if len(label) == 1:
+        code = ord(label)
+        return [(code, code)]
+    i = 1
+    end = len(label) - 1
+    pending_range = False
+    ranges = []
+    while i < end:
+        ch = label[i]
+        if ch == '\\':
+            kind = label[i + 1]
+            if kind == 'x':
+                code, i = int(label[i + 2:i + 4], 16), i + 4
+            elif kind == 'u':
+                code, i = int(label[i + 2:i + 6], 16), i + 6
+            elif kind == 'U':
+                code, i = int(label[i + 2:i + 10], 16), i + 10
+            else:
+                code, i = ord(kind), i + 2
+        elif ch == '-':
+            pending_range = True
+            i += 1
+            continue
+        else:
+            code, i = ord(ch), i + 1
+        if pending_range:
+            ranges[-1] = (ranges[-1][0], code)
+            pending_range = False
+        else:
+            ranges.append((code, code))
+    return normalize_ranges(ranges)
+
+def partition_alphabet(range_sets):
+    """
+    Divide el alfabeto en clases de equivalencia disjuntas.
+
+    Parámetros:
+      - range_sets: lista de listas normalizadas de rangos (por ejemplo, una por etiqueta).
+
+    Retorna:
+      - classes: lista de clases; cada clase es una lista normalizada de rangos. Dos caracteres
+        están en la misma clase si pertenecen exactamente a los mismos conjuntos de range_sets.
+      - members: lista paralela a range_sets; members[i] es la lista de índices de las clases
+        contenidas en range_sets[i].
+    """
+    # Puntos de corte: cada inicio y cada fin + 1 delimitan intervalos elementales.
+    cuts = sorted({lo for ranges in range_sets for lo, _ in ranges} |
+                  {hi + 1 for ranges in range_sets for _, hi in ranges})
+    covering = [[] for _ in cuts]
+    for set_id, ranges in enumerate(range_sets):
+        for lo, hi in ranges:
+            k = bisect_right(cuts, lo) - 1
+            while cuts[k] <= hi:
+                covering[k].append(set_id)
+                k += 1
+
+    # Agrupar los intervalos elementales por su firma (conjuntos que los contienen).
+    class_of_signature = {}
+    classes = []
+    members = [[] for _ in range_sets]
+    for k in range(len(cuts) - 1):
+        if not covering[k]:
+            continue
+        signature = tuple(covering[k])
+        cls = class_of_signature.get(signature)
+        if cls is None:
+            cls = class_of_signature[signature] = len(classes)
+            classes.append([])
+            for set_id in signature:
+                members[set_id].append(cls)
+        classes[cls].append((cuts[k], cuts[k + 1] - 1))
+    return [normalize_ranges(c) for c in classes], members
+
+class SymbolClassMap(dict):
+    """
+    Diccionario carácter -> valor (id de clase o etiqueta) para clases disjuntas.
+
+    Los caracteres de rangos pequeños se guardan directamente en el diccionario; los de
+    rangos anchos se resuelven en __missing__ con búsqueda binaria, sin agregarlos al
+    diccionario. Así el acceso m[ch] cuesta lo mismo que un dict normal en el caso común.
+    Un carácter que no pertenece a ninguna clase produce el valor missing.
+    """
+    __slots__ = ("_starts", "_ends", "_values", "missing")
+
+    def __init__(self, items, missing=None, prefill=()):
+        """
+        Parámetros:
+          - items: iterable de (rangos, valor) con rangos disjuntos entre sí.
+          - missing: valor para caracteres fuera de todas las clases.
+          - prefill: caracteres que se guardan explícitamente con el valor que les corresponda
+            (missing si no pertenecen a ninguna clase) para evitar __missing__ en ellos.
+        """
+        super().__init__()
+        self.missing = missing
+        wide = []
+        for ranges, value in items:
+            for lo, hi in ranges:
+                if hi - lo < DICT_EXPANSION_LIMIT:
+                    for code in range(lo, hi + 1):
+                        self[chr(code)] = value
+                else:
+                    wide.append((lo, hi, value))
+        wide.sort()
+        self._starts = [lo for lo, _, _ in wide]
+        self._ends = [hi for _, hi, _ in wide]
+        self._values = [value for _, _, value in wide]
+        for ch in prefill:
+            if ch not in self:
+                self[ch] = self.__missing__(ch)
+
+    def __missing__(self, ch):
+        k = bisect_right(self._starts, ord(ch)) - 1
+        if k >= 0 and ord(ch) <= self._ends[k]:
+            return self._values[k]
+        return self.missing
+
+    def __reduce__(self):
+        return (_rebuild_class_map, (dict(self), self.missing, self._starts, self._ends, self._values))
+
+def _rebuild_class_map(items, missing, starts, ends, values):
+    m = SymbolClassMap((), missing)
+    m.update(items)
+    m._starts, m._ends, m._values = starts, ends, values
+    return m
+
+def label_classifier(labels):
+    """
+    Retorna un SymbolClassMap carácter -> etiqueta para un conjunto de etiquetas disjuntas
+    (por ejemplo, las llaves de las transiciones de un DFA). Los caracteres sin clase dan None.
+    """
+    return SymbolClassMap((label_ranges(label), label) for label in labels)